@@ -2,7 +2,18 @@
 from flask import request
 from flask_restful import Resource, marshal_with, fields
 import os
-from flask import Flask, request, make_response, jsonify, session
+import json
+import base64
+from flask import (
+    Flask,
+    request,
+    make_response,
+    jsonify,
+    session,
+    Response,
+    stream_with_context,
+    abort,
+)
 from flask_migrate import Migrate
 from flask_restful import Api, Resource
 from flask_sqlalchemy import SQLAlchemy
@@ -18,33 +29,314 @@ from wtforms import (
 )
 from wtforms.validators import DataRequired
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import event as sa_event, inspect as sa_inspect, insert, update
+from sqlalchemy.orm import selectinload
 
 # from models import db, Event, Task, User
-from models import db, Task, User, Event, Expense, Budget, Participant, EventResource
+from models import (
+    db,
+    utcnow,
+    Task,
+    User,
+    Event,
+    Expense,
+    Budget,
+    Participant,
+    EventResource,
+    EventStats,
+    TaskDependency,
+)
+from event_stats import event_stats_cli, refresh_event_stats, changed_child_event_ids
+from versioning import bump_event_versions
+from reservations import check_bookings, find_conflict, free_resources, booking_payload
+from changefeed import (
+    ChangeFeed,
+    ChangeStreamsFull,
+    changes_cli,
+    mark_changes_logged,
+    record_bulk_changes,
+)
+from deadlines import ReminderScheduler, due_tasks, reminders_cli
+from event_calendar import GRANULARITIES, count_buckets, event_buckets
+from search import match_expression, search_events, search_supported, search_tasks
+from task_graph import (
+    COMPLETED,
+    delete_edges,
+    find_cycle,
+    load_graph,
+    refresh_dependents,
+    schedule,
+)
+from hashing import PasswordHasher, HashingPoolSaturated, default_pool_workers
+from cache import create_cache
+from profiling import RequestMetrics, PROMETHEUS_CONTENT_TYPE
+from compression import ResponseCompression
+from representations import create_encoder, json_representation
+from database import configure_database, register_sqlite_pragmas
+from serializers import (
+    serialize_event_details,
+    event_serializer,
+    task_serializer,
+    resource_serializer,
+    expense_serializer,
+    user_serializer,
+)
 from flask_cors import CORS
-from flask_restful import reqparse
+from flask_restful import reqparse, inputs
 import jwt
 from flask_jwt_extended import JWTManager
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import get_current_user
 from werkzeug.security import generate_password_hash
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from functools import wraps
+from collections import namedtuple
+from urllib.parse import urlencode
+import hashlib
+from werkzeug.http import http_date, quote_etag, unquote_etag
+from werkzeug.http import parse_date as parse_http_date
+from flask_restful.utils import unpack
+from decimal import Decimal
 
 
 app = Flask(__name__)
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///app.db"
+configure_database(app)
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 app.config["JWT_SECRET_KEY"] = b"BM3\x1d\x16z!\x0e:\x8b&\xe6"
 app.config["SECRET_KEY"] = "your_very_secret_key_here"
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=1)
+app.config["BCRYPT_LOG_ROUNDS"] = int(os.environ.get("BCRYPT_LOG_ROUNDS", 12))
+app.config["HASH_POOL_WORKERS"] = int(
+    os.environ.get("HASH_POOL_WORKERS", default_pool_workers())
+)
+app.config["USER_CACHE_URL"] = os.environ.get("USER_CACHE_URL", "memory://")
+app.config["USER_CACHE_SIZE"] = int(os.environ.get("USER_CACHE_SIZE", 10000))
+app.config["USER_CACHE_TTL"] = int(os.environ.get("USER_CACHE_TTL", 300))
+app.config["RESPONSE_CACHE_URL"] = os.environ.get("RESPONSE_CACHE_URL", "memory://")
+app.config["RESPONSE_CACHE_SIZE"] = int(os.environ.get("RESPONSE_CACHE_SIZE", 2048))
+app.config["RESPONSE_CACHE_TTL"] = int(os.environ.get("RESPONSE_CACHE_TTL", 60))
+app.config["METRICS_ENABLED"] = os.environ.get("METRICS_ENABLED", "0") == "1"
+app.config["METRICS_QUERY_WARN"] = int(os.environ.get("METRICS_QUERY_WARN", 50))
+app.config["PROFILE_SAMPLE_RATE"] = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+app.config["PROFILE_DIR"] = os.environ.get("PROFILE_DIR", "profiles")
+app.config["PROFILER"] = os.environ.get("PROFILER", "cprofile")
+app.config["API_JSON_ENCODER"] = os.environ.get("API_JSON_ENCODER", "orjson")
+app.config["COMPRESS_ENABLED"] = os.environ.get("COMPRESS_ENABLED", "1") == "1"
+app.config["COMPRESS_ALGORITHMS"] = os.environ.get("COMPRESS_ALGORITHMS")
+app.config["COMPRESS_MIN_SIZE"] = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+for key in (
+    "COMPRESS_LEVEL",
+    "COMPRESS_GZIP_LEVEL",
+    "COMPRESS_BR_LEVEL",
+    "COMPRESS_ZSTD_LEVEL",
+):
+    if key in os.environ:
+        app.config[key] = int(os.environ[key])
+app.config["REMINDER_INTERVAL"] = float(os.environ.get("REMINDER_INTERVAL", 60))
+app.config["REMINDER_LEAD_HOURS"] = float(os.environ.get("REMINDER_LEAD_HOURS", 24))
+app.config["REMINDER_BATCH_SIZE"] = int(os.environ.get("REMINDER_BATCH_SIZE", 500))
+for key, default in (
+    ("CHANGE_STREAM_POLL_INTERVAL", 1),
+    ("CHANGE_STREAM_HEARTBEAT", 15),
+    ("CHANGE_STREAM_MAX_SECONDS", 300),
+):
+    app.config[key] = float(os.environ.get(key, default))
+app.config["CHANGE_STREAM_MAX_CONCURRENT"] = int(
+    os.environ.get("CHANGE_STREAM_MAX_CONCURRENT", 4)
+)
 jwt = JWTManager(app)
 
 db.init_app(app)
+with app.app_context():
+    register_sqlite_pragmas(db.engine, app.config)
+    request_metrics = RequestMetrics(app, db.engine)
 bcrypt = Bcrypt(app)
+password_hasher = PasswordHasher(app)
+response_compression = ResponseCompression(app)
+reminder_scheduler = ReminderScheduler(app)
+change_feed = ChangeFeed(app)
 api = Api(app)
+json_encoder = create_encoder(app.config["API_JSON_ENCODER"])
+api.representation("application/json")(json_representation(json_encoder))
 CORS(app)
 
 migrate = Migrate(app, db)
+app.cli.add_command(event_stats_cli)
+app.cli.add_command(reminders_cli)
+app.cli.add_command(changes_cli)
+
+
+user_cache = create_cache(
+    app.config["USER_CACHE_URL"],
+    maxsize=app.config["USER_CACHE_SIZE"],
+    ttl=app.config["USER_CACHE_TTL"],
+    prefix="user:",
+)
+
+
+@jwt.user_lookup_loader
+def load_user(jwt_header, jwt_data):
+    # The serialized user is cached per JWT identity, so authenticated
+    # requests skip the users table until the entry expires or changes.
+    username = jwt_data["sub"]
+    user_data = user_cache.get(username)
+    if user_data is None:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            # An empty dict rather than None: Flask-RESTful would turn the
+            # resulting UserLookupError into a 500, so endpoints that need
+            # the user check for it themselves.
+            return {}
+        user_data = user_serializer(user)
+        user_cache.set(username, user_data)
+    return user_data
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def collect_changed_users(session, flush_context):
+    usernames = session.info.setdefault("stale_usernames", set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            history = sa_inspect(instance).attrs.username.history
+            usernames.update(name for name in history.sum() if name is not None)
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def invalidate_changed_users(session):
+    usernames = session.info.pop("stale_usernames", None)
+    if usernames:
+        user_cache.delete(*usernames)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_changed_users(session):
+    session.info.pop("stale_usernames", None)
+
+
+response_cache = create_cache(
+    app.config["RESPONSE_CACHE_URL"],
+    maxsize=app.config["RESPONSE_CACHE_SIZE"],
+    ttl=app.config["RESPONSE_CACHE_TTL"],
+    prefix="response:",
+)
+
+# Cached responses are keyed under the event they were built from, so a
+# write invalidates exactly that event's entries. The event list is only
+# invalidated when an event row itself changes. Invalidation reaches only
+# this process's memory:// cache: event entries are also keyed by the
+# event's version, so other workers miss once it moves, but the event list
+# can stay stale for up to RESPONSE_CACHE_TTL. Deployments running several
+# workers should point RESPONSE_CACHE_URL at a shared redis:// server.
+EVENT_LIST_CACHE_PREFIX = "events:"
+
+
+def event_cache_prefix(event_id):
+    return f"event:{event_id}:"
+
+
+def mark_events_changed(session, event_ids, event_rows=False):
+    prefixes = session.info.setdefault("stale_cache_prefixes", set())
+    prefixes.update(event_cache_prefix(event_id) for event_id in event_ids)
+    if event_rows:
+        prefixes.add(EVENT_LIST_CACHE_PREFIX)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def collect_changed_events(session, flush_context):
+    mark_events_changed(session, changed_child_event_ids(session))
+    mark_events_changed(
+        session,
+        [
+            instance.id
+            for instance in (*session.new, *session.dirty, *session.deleted)
+            if isinstance(instance, Event)
+        ],
+        event_rows=True,
+    )
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def invalidate_changed_events(session):
+    for prefix in session.info.pop("stale_cache_prefixes", ()):
+        response_cache.delete_prefix(prefix)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_changed_events(session):
+    session.info.pop("stale_cache_prefixes", None)
+
+
+def cached_response(method):
+    """Cache a successful GET result keyed by route, query string and Accept.
+
+    The payload is stored already encoded and served back as a JSON
+    fragment, so a hit is not encoded again. Conditional request headers are
+    evaluated against the cached ETag and Last-Modified, so a hit can still
+    be answered with 304. Responses of one event are also keyed by its
+    version, so a write in another process is never served from this one.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        event_id = kwargs.get("event_id")
+        prefix = (
+            event_cache_prefix(event_id)
+            if event_id is not None
+            else EVENT_LIST_CACHE_PREFIX
+        )
+        if event_id is not None:
+            current = event_version(event_id)
+            if current is None:
+                return method(self, *args, **kwargs)
+            prefix = f"{prefix}v{current.version}:"
+        query = urlencode(sorted(request.args.items(multi=True)))
+        key = f"{prefix}{request.path}?{query}|{request.accept_mimetypes.best}"
+
+        entry = response_cache.get(key)
+        if entry is None:
+            result = method(self, *args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            data, status, headers = unpack(result)
+            if status != 200:
+                return result
+            entry = [json_encoder.encode(data).decode("utf-8"), dict(headers or {})]
+            response_cache.set(key, entry)
+
+        body, headers = entry
+        if "ETag" in headers:
+            tag = unquote_etag(headers["ETag"])[0]
+            last_modified = parse_http_date(headers.get("Last-Modified"))
+            if is_not_modified(tag, last_modified):
+                return not_modified(headers)
+        return json_encoder.fragment(body), 200, headers
+
+    return wrapper
+
+
+class CacheStatsResource(Resource):
+    def get(self):
+        return {
+            "response_cache": dict(
+                response_cache.stats.as_dict(), entries=len(response_cache)
+            ),
+            "user_cache": dict(user_cache.stats.as_dict(), entries=len(user_cache)),
+        }, 200
+
+
+class MetricsResource(Resource):
+    def get(self):
+        if not request_metrics.enabled:
+            return {"message": "Metrics are disabled"}, 404
+        return Response(request_metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def hashing_saturated_response():
+    return (
+        {"error": "Too many concurrent requests. Please retry shortly."},
+        429,
+        {"Retry-After": "1"},
+    )
 
 
 class SignupResource(Resource):
@@ -82,9 +374,10 @@ class SignupResource(Resource):
                 400,
             )
 
-        hashed_password = bcrypt.generate_password_hash(data["password"]).decode(
-            "utf-8"
-        )
+        try:
+            hashed_password = password_hasher.hash_password(data["password"])
+        except HashingPoolSaturated:
+            return hashing_saturated_response()
         new_user = User(
             username=data["username"],
             email=data["email"],
@@ -122,7 +415,21 @@ class LoginResource(Resource):
 
         user = User.query.filter_by(username=username).first()
 
-        if user and bcrypt.check_password_hash(user.password, password):
+        try:
+            authenticated = user is not None and password_hasher.check_password(
+                user.password, password
+            )
+        except HashingPoolSaturated:
+            return hashing_saturated_response()
+
+        if authenticated:
+            if password_hasher.needs_rehash(user.password):
+                # Upgrade the stored hash to the configured work factor
+                try:
+                    user.password = password_hasher.hash_password(password)
+                    db.session.commit()
+                except HashingPoolSaturated:
+                    pass
             access_token = create_access_token(identity=username)
             return jsonify(access_token=access_token)
         else:
@@ -149,11 +456,10 @@ class AuthResource(Resource):
 class CheckSessionResource(Resource):
     @jwt_required()
     def get(self):
-        # Use the JWT identity to fetch the user details
-        username = get_jwt_identity()
-        user = User.query.filter_by(username=username).first()
-        if user:
-            return user.to_dict(), 200
+        # The user was loaded (or served from cache) by load_user
+        user_data = get_current_user()
+        if user_data:
+            return user_data, 200
         return {"error": "User not found"}, 401
 
 
@@ -238,18 +544,336 @@ class EventCreate(Resource):
         return new_event, 201
 
 
+def conditional_headers(tag, last_modified=None):
+    headers = {"ETag": quote_etag(tag, weak=True)}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.replace(tzinfo=timezone.utc))
+    return headers
+
+
+def is_not_modified(tag, last_modified=None):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(tag)
+    if last_modified is not None and request.if_modified_since:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def event_version(event_id):
+    """Return (version, updated_at) for an event without loading the row."""
+    return (
+        db.session.query(Event.version, Event.updated_at).filter_by(id=event_id).first()
+    )
+
+
+def not_modified(headers):
+    return Response(status=304, headers=headers)
+
+
+EVENT_LIST_DEFAULT_LIMIT = 50
+EVENT_LIST_MAX_LIMIT = 500
+EVENT_STREAM_BATCH_SIZE = 500
+
+
+def encode_cursor(value, row_id):
+    # A cursor is the (sort value, id) key of the last row on a page
+    key = [value.isoformat() if value else None, row_id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    return (datetime.fromisoformat(value) if value else None), int(row_id)
+
+
+def after_cursor(sort_column, id_column, cursor):
+    """Rows after ``cursor`` in (sort_column NULLS FIRST, id_column) order."""
+    value, row_id = cursor
+    if value is None:
+        # NULLs sort first, so everything with a value comes after them
+        return db.or_(
+            sort_column.isnot(None),
+            db.and_(sort_column.is_(None), id_column > row_id),
+        )
+    return db.or_(
+        sort_column > value,
+        db.and_(sort_column == value, id_column > row_id),
+    )
+
+
+def parse_date_arg(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+event_list_parser = reqparse.RequestParser()
+event_list_parser.add_argument("limit", type=int, location="args")
+event_list_parser.add_argument("cursor", type=str, location="args")
+event_list_parser.add_argument("category", type=str, location="args")
+event_list_parser.add_argument("user_id", type=int, location="args")
+event_list_parser.add_argument("from", type=parse_date_arg, location="args")
+event_list_parser.add_argument("to", type=parse_date_arg, location="args")
+event_list_parser.add_argument("format", type=str, location="args")
+
+
 class EventList(Resource):
-    @marshal_with(event_fields)
+    @cached_response
+    def get(self):
+        args = event_list_parser.parse_args()
+
+        query = Event.query
+        if args["category"]:
+            query = query.filter(Event.category == args["category"])
+        if args["user_id"] is not None:
+            query = query.filter(Event.user_id == args["user_id"])
+        if args["from"]:
+            query = query.filter(Event.date >= args["from"])
+        if args["to"]:
+            # "to" is inclusive of the whole day
+            query = query.filter(Event.date < args["to"] + timedelta(days=1))
+
+        if args["cursor"]:
+            try:
+                cursor = decode_cursor(args["cursor"])
+            except (ValueError, TypeError):
+                return {"message": "Invalid cursor."}, 400
+            query = query.filter(after_cursor(Event.date, Event.id, cursor))
+
+        query = query.order_by(Event.date.asc().nulls_first(), Event.id.asc())
+
+        limit = args["limit"]
+        if limit is not None and limit < 1:
+            return {"message": "limit must be a positive integer."}, 400
+
+        wants_stream = args["format"] == "ndjson" or (
+            request.accept_mimetypes.best == "application/x-ndjson"
+        )
+        if wants_stream:
+            # Streams every matching event (or up to `limit`) one JSON
+            # document per line, holding only one batch of rows at a time
+            if limit is not None:
+                query = query.limit(limit)
+
+            def generate():
+                for event in query.yield_per(EVENT_STREAM_BATCH_SIZE):
+                    yield json_encoder.dumps(event_serializer(event))
+
+            return Response(
+                stream_with_context(generate()), mimetype="application/x-ndjson"
+            )
+
+        limit = min(limit or EVENT_LIST_DEFAULT_LIMIT, EVENT_LIST_MAX_LIMIT)
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+
+        # The page's ETag covers the id and version of every row on it, read
+        # from the index-ordered scan before any event is loaded
+        keys = query.with_entities(Event.id, Event.version, Event.updated_at).all()
+        digest = hashlib.sha1(request.full_path.encode("utf-8"))
+        for key_id, key_version, _ in keys:
+            digest.update(f"{key_id}:{key_version};".encode("ascii"))
+        tag = f"events-{digest.hexdigest()}"
+        last_modified = max(
+            (updated_at for _, _, updated_at in keys if updated_at), default=None
+        )
+        headers = conditional_headers(tag, last_modified)
+        if is_not_modified(tag, last_modified):
+            return not_modified(headers)
+
+        events = query.all()
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1].date, events[-1].id)
+            headers["X-Next-Cursor"] = next_cursor
+            next_args = request.args.to_dict()
+            next_args["cursor"] = next_cursor
+            next_args["limit"] = limit
+            next_url = request.base_url + "?" + urlencode(next_args)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        return event_serializer.many(events), 200, headers
+
+
+CALENDAR_MAX_DAYS = 366
+
+calendar_parser = reqparse.RequestParser()
+calendar_parser.add_argument(
+    "from", type=parse_date_arg, location="args", required=True
+)
+calendar_parser.add_argument("to", type=parse_date_arg, location="args", required=True)
+calendar_parser.add_argument(
+    "granularity", type=str, location="args", choices=GRANULARITIES, default="day"
+)
+calendar_parser.add_argument("counts", type=inputs.boolean, location="args")
+
+
+class EventCalendar(Resource):
+    """Events starting between two dates, bucketed by day, week or month.
+
+    ``counts=true`` returns only the number of events per bucket, which is
+    all a month view needs; otherwise each bucket lists its events in start
+    order, for at most CALENDAR_MAX_DAYS days.
+    """
+
+    @cached_response
     def get(self):
-        events = Event.query.all()
-        return events
+        args = calendar_parser.parse_args()
+        # "to" is inclusive of the whole day
+        start, end = args["from"], args["to"] + timedelta(days=1)
+        if end <= start:
+            return {"message": "'to' must not be before 'from'."}, 400
+        payload = {
+            "from": start.date().isoformat(),
+            "to": args["to"].date().isoformat(),
+            "granularity": args["granularity"],
+        }
+        if args["counts"]:
+            payload["buckets"] = [
+                {"start": bucket, "count": count}
+                for bucket, count in count_buckets(
+                    db.session, start, end, args["granularity"]
+                )
+            ]
+            return payload, 200
+
+        if end - start > timedelta(days=CALENDAR_MAX_DAYS):
+            return {
+                "message": f"Ranges over {CALENDAR_MAX_DAYS} days need counts=true."
+            }, 400
+        payload["buckets"] = [
+            {
+                "start": bucket,
+                "count": len(events),
+                "events": event_serializer.many(events),
+            }
+            for bucket, events in event_buckets(
+                db.session, start, end, args["granularity"]
+            )
+        ]
+        return payload, 200
+
+
+DASHBOARD_DEFAULT_LIMIT = 20
+DASHBOARD_MAX_LIMIT = 100
+DASHBOARD_SECTIONS = ("tasks", "participating", "owned")
+
+dashboard_parser = reqparse.RequestParser()
+dashboard_parser.add_argument(
+    "section", type=str, location="args", choices=DASHBOARD_SECTIONS
+)
+dashboard_parser.add_argument("cursor", type=str, location="args")
+dashboard_parser.add_argument(
+    "limit", type=int, location="args", default=DASHBOARD_DEFAULT_LIMIT
+)
+
+
+class DashboardResource(Resource):
+    """The current user's assigned tasks, participations and owned events.
+
+    Each section is one keyset-paginated query: tasks by deadline, events by
+    date. Without ``section`` the first page of every section is returned;
+    a section's ``next_cursor`` is passed back with ``section`` to page it.
+    """
+
+    @staticmethod
+    def tasks(user_id):
+        # Walks ix_task_assigned_to_deadline_id in page order
+        query = (
+            db.session.query(Task, Event.title)
+            .outerjoin(Event, Event.id == Task.event_id)
+            .filter(Task.assigned_to == user_id)
+        )
+
+        def serialize(task, event_title):
+            return dict(
+                task_serializer(task), event_id=task.event_id, event_title=event_title
+            )
+
+        return query, Task.deadline, Task.id, serialize
+
+    @staticmethod
+    def participating(user_id):
+        query = (
+            db.session.query(Event, Participant.status, Participant.role)
+            .join(Participant, Participant.event_id == Event.id)
+            .filter(Participant.user_id == user_id)
+        )
+
+        def serialize(event, status, role):
+            return dict(
+                event_serializer(event), participation={"status": status, "role": role}
+            )
+
+        return query, Event.date, Participant.id, serialize
+
+    @staticmethod
+    def owned(user_id):
+        # Walks ix_event_user_id_date_id in page order
+        query = Event.query.filter(Event.user_id == user_id)
+        return query, Event.date, Event.id, event_serializer
+
+    @staticmethod
+    def page(section, cursor, limit):
+        query, sort_column, id_column, serialize = section
+        if cursor is not None:
+            query = query.filter(after_cursor(sort_column, id_column, cursor))
+        # The sort key rides along for the next cursor; one extra row tells
+        # whether there is a next page
+        rows = (
+            query.add_columns(sort_column, id_column)
+            .order_by(sort_column.asc().nulls_first(), id_column.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+        return {
+            "items": [serialize(*row[:-2]) for row in rows],
+            "next_cursor": next_cursor,
+        }
+
+    @jwt_required()
+    def get(self):
+        user_data = get_current_user()
+        if not user_data:
+            return {"error": "User not found"}, 401
+        args = dashboard_parser.parse_args()
+        if args["limit"] < 1:
+            return {"message": "limit must be a positive integer."}, 400
+        limit = min(args["limit"], DASHBOARD_MAX_LIMIT)
+
+        cursor = None
+        if args["cursor"]:
+            if args["section"] is None:
+                return {"message": "A cursor needs the section it belongs to."}, 400
+            try:
+                cursor = decode_cursor(args["cursor"])
+            except (ValueError, TypeError):
+                return {"message": "Invalid cursor."}, 400
+
+        sections = (args["section"],) if args["section"] else DASHBOARD_SECTIONS
+        payload = {"user_id": user_data["id"], "limit": limit}
+        for name in sections:
+            section = getattr(self, name)(user_data["id"])
+            payload[name] = self.page(section, cursor, limit)
+        return payload, 200
 
 
 class EventDetail(Resource):
-    @marshal_with(event_fields)
+    @cached_response
     def get(self, event_id):
+        version = event_version(event_id)
+        if version is None:
+            abort(404)
+        tag = f"event-{event_id}-{version[0]}"
+        headers = conditional_headers(tag, version[1])
+        if is_not_modified(tag, version[1]):
+            return not_modified(headers)
         event = Event.query.get_or_404(event_id)
-        return event
+        return event_serializer(event), 200, headers
 
 
 class EventUpdate(Resource):
@@ -289,6 +913,43 @@ class EventDelete(Resource):
         return {"message": "Event deleted successfully."}, 200
 
 
+class EventChangeStream(Resource):
+    """Server-sent events with the changes of one event (see changefeed.py).
+
+    Resumes after the Last-Event-ID header (or ``last_event_id``) when given,
+    otherwise starts with the next change. Answers 503 while this process
+    already holds CHANGE_STREAM_MAX_CONCURRENT streams.
+    """
+
+    def get(self, event_id):
+        last_id = request.headers.get("Last-Event-ID") or request.args.get(
+            "last_event_id"
+        )
+        if last_id is not None:
+            try:
+                last_id = int(last_id)
+            except ValueError:
+                return {"message": "Last-Event-ID must be an integer."}, 400
+        elif event_version(event_id) is None:
+            # A resuming client may still be owed the event's deletion
+            abort(404)
+        try:
+            change_feed.acquire_slot()
+        except ChangeStreamsFull:
+            return (
+                {"error": "Too many open change streams. Please retry shortly."},
+                503,
+                {"Retry-After": "5"},
+            )
+        response = Response(
+            change_feed.stream(db.engine, event_id, last_id),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        response.call_on_close(change_feed.release_slot)
+        return response
+
+
 class TaskCreate(Resource):
     def post(self, event_id):
         event = Event.query.get_or_404(event_id)
@@ -312,36 +973,23 @@ class TaskCreate(Resource):
 
 
 class TaskList(Resource):
+    @cached_response
     def get(self, event_id):
+        headers = {}
+        version = event_version(event_id)
+        if version is not None:
+            tag = f"tasks-{event_id}-{version[0]}"
+            headers = conditional_headers(tag, version[1])
+            if is_not_modified(tag, version[1]):
+                return not_modified(headers)
         tasks = Task.query.filter_by(event_id=event_id).all()
-        return [
-            {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "deadline": task.deadline.isoformat() if task.deadline else None,
-                "priority": task.priority,
-                "status": task.status,
-                "assigned_to": task.assigned_to,
-                "dependency": task.dependency,
-            }
-            for task in tasks
-        ], 200
+        return task_serializer.many(tasks), 200, headers
 
 
 class TaskDetail(Resource):
     def get(self, event_id, task_id):
         task = Task.query.filter_by(event_id=event_id, id=task_id).first_or_404()
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "deadline": task.deadline.isoformat() if task.deadline else None,
-            "priority": task.priority,
-            "status": task.status,
-            "assigned_to": task.assigned_to,
-            "dependency": task.dependency,
-        }, 200
+        return task_serializer(task), 200
 
 
 class TaskUpdate(Resource):
@@ -377,12 +1025,31 @@ class TaskDelete(Resource):
         return {"message": "Task deleted successfully."}, 200
 
 
+def booking_error(resource_ids):
+    # Run after the rows are flushed; see reservations.py
+    invalid, conflicts = check_bookings(db.session, resource_ids)
+    if invalid:
+        return {
+            "error": "reservation_end must be after reservation_date",
+            "invalid": invalid,
+        }, 400
+    if conflicts:
+        return {
+            "error": "Resource is already booked in that window",
+            "conflicts": conflicts,
+        }, 409
+    return None
+
+
 class ResourceCreate(Resource):
     def post(self, event_id):
         data = request.get_json()
         reservation_date = data.get("reservation_date")
         if reservation_date:
             reservation_date = datetime.strptime(reservation_date, "%Y-%m-%dT%H:%M:%S")
+        reservation_end = data.get("reservation_end")
+        if reservation_end:
+            reservation_end = datetime.strptime(reservation_end, "%Y-%m-%dT%H:%M:%S")
 
         new_resource = EventResource(
             event_id=event_id,
@@ -390,29 +1057,30 @@ class ResourceCreate(Resource):
             type=data["type"],
             availability=data.get("availability", True),
             reservation_date=reservation_date,
+            reservation_end=reservation_end,
         )
         db.session.add(new_resource)
+        db.session.flush()
+        error = booking_error([new_resource.id])
+        if error:
+            db.session.rollback()
+            return error
         db.session.commit()
         return {"message": "Resource allocated successfully to the event."}, 201
 
 
 class ResourceList(Resource):
+    @cached_response
     def get(self, event_id):
+        headers = {}
+        version = event_version(event_id)
+        if version is not None:
+            tag = f"resources-{event_id}-{version[0]}"
+            headers = conditional_headers(tag, version[1])
+            if is_not_modified(tag, version[1]):
+                return not_modified(headers)
         resources = EventResource.query.filter_by(event_id=event_id).all()
-        return [
-            {
-                "id": resource.id,
-                "name": resource.name,
-                "type": resource.type,
-                "availability": resource.availability,
-                "reservation_date": (
-                    resource.reservation_date.isoformat()
-                    if resource.reservation_date
-                    else None
-                ),
-            }
-            for resource in resources
-        ], 200
+        return resource_serializer.many(resources), 200, headers
 
 
 class ResourceDetail(Resource):
@@ -420,17 +1088,7 @@ class ResourceDetail(Resource):
         resource = EventResource.query.filter_by(
             event_id=event_id, id=resource_id
         ).first_or_404()
-        return {
-            "id": resource.id,
-            "name": resource.name,
-            "type": resource.type,
-            "availability": resource.availability,
-            "reservation_date": (
-                resource.reservation_date.isoformat()
-                if resource.reservation_date
-                else None
-            ),
-        }, 200
+        return resource_serializer(resource), 200
 
 
 class ResourceUpdate(Resource):
@@ -442,12 +1100,21 @@ class ResourceUpdate(Resource):
         reservation_date = data.get("reservation_date")
         if reservation_date:
             reservation_date = datetime.strptime(reservation_date, "%Y-%m-%dT%H:%M:%S")
+        reservation_end = data.get("reservation_end")
+        if reservation_end:
+            reservation_end = datetime.strptime(reservation_end, "%Y-%m-%dT%H:%M:%S")
 
         resource.name = data.get("name", resource.name)
         resource.type = data.get("type", resource.type)
         resource.availability = data.get("availability", resource.availability)
         resource.reservation_date = reservation_date
+        resource.reservation_end = reservation_end
 
+        db.session.flush()
+        error = booking_error([resource.id])
+        if error:
+            db.session.rollback()
+            return error
         db.session.commit()
         return {"message": "Resource updated successfully."}, 200
 
@@ -462,6 +1129,104 @@ class ResourceDelete(Resource):
         return {"message": "Resource removed successfully."}, 200
 
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+search_parser = reqparse.RequestParser()
+search_parser.add_argument("q", type=str, location="args", required=True)
+search_parser.add_argument(
+    "type", type=str, location="args", choices=("events", "tasks")
+)
+search_parser.add_argument("category", type=str, location="args")
+search_parser.add_argument("status", type=str, location="args")
+search_parser.add_argument("from", type=parse_date_arg, location="args")
+search_parser.add_argument("to", type=parse_date_arg, location="args")
+search_parser.add_argument(
+    "limit", type=int, location="args", default=SEARCH_DEFAULT_LIMIT
+)
+search_parser.add_argument("offset", type=int, location="args", default=0)
+
+
+class SearchResource(Resource):
+    def get(self):
+        args = search_parser.parse_args()
+        if not search_supported(db.session.connection()):
+            return {"message": "Search needs the SQLite FTS5 index."}, 501
+        match = match_expression(args["q"])
+        if match is None:
+            return {"message": "q must contain at least one word."}, 400
+        if args["limit"] < 1 or args["offset"] < 0:
+            return {"message": "limit must be positive and offset not negative."}, 400
+        page = (min(args["limit"], SEARCH_MAX_LIMIT), args["offset"])
+
+        result = {"query": args["q"], "limit": page[0], "offset": page[1]}
+        if args["type"] in (None, "events"):
+            # "to" is inclusive of the whole day
+            end = args["to"] + timedelta(days=1) if args["to"] else None
+            total, rows, facets = search_events(
+                db.session, match, page, args["category"], args["from"], end
+            )
+            result["events"] = {
+                "total": total,
+                "results": [
+                    dict(event_serializer(row), score=row.score) for row in rows
+                ],
+                "facets": facets,
+            }
+        if args["type"] in (None, "tasks"):
+            total, rows, facets = search_tasks(
+                db.session, match, page, args["status"]
+            )
+            result["tasks"] = {
+                "total": total,
+                "results": [
+                    dict(task_serializer(row), event_id=row.event_id, score=row.score)
+                    for row in rows
+                ],
+                "facets": facets,
+            }
+        return result, 200
+
+
+resource_availability_parser = reqparse.RequestParser()
+resource_availability_parser.add_argument(
+    "type", type=str, location="args", required=True
+)
+resource_availability_parser.add_argument("name", type=str, location="args")
+resource_availability_parser.add_argument(
+    "from", type=datetime.fromisoformat, location="args", required=True
+)
+resource_availability_parser.add_argument(
+    "to", type=datetime.fromisoformat, location="args", required=True
+)
+
+
+class ResourceAvailability(Resource):
+    """Whether one resource, or which resources of a type, are free in a window.
+
+    Not response-cached: bookings of any event change the answer.
+    """
+
+    def get(self):
+        args = resource_availability_parser.parse_args()
+        start, end = args["from"], args["to"]
+        if end <= start:
+            return {"error": "'to' must be after 'from'"}, 400
+        payload = {
+            "type": args["type"],
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+        }
+        if args["name"] is not None:
+            booking = find_conflict(db.session, args["type"], args["name"], start, end)
+            payload["name"] = args["name"]
+            payload["free"] = booking is None
+            payload["conflict"] = booking_payload(booking) if booking else None
+        else:
+            payload["free"] = free_resources(db.session, args["type"], start, end)
+        return payload, 200
+
+
 class ExpenseCreate(Resource):
     def post(self, event_id):
         data = request.get_json()
@@ -478,17 +1243,10 @@ class ExpenseCreate(Resource):
 
 
 class ExpenseList(Resource):
+    @cached_response
     def get(self, event_id):
         expenses = Expense.query.filter_by(event_id=event_id).all()
-        return [
-            {
-                "id": expense.id,
-                "name": expense.name,
-                "amount": str(expense.amount),
-                "date": expense.date.isoformat() if expense.date else None,
-            }
-            for expense in expenses
-        ], 200
+        return expense_serializer.many(expenses), 200
 
 
 class ExpenseDetail(Resource):
@@ -496,12 +1254,7 @@ class ExpenseDetail(Resource):
         expense = Expense.query.filter_by(
             event_id=event_id, id=expense_id
         ).first_or_404()
-        return {
-            "id": expense.id,
-            "name": expense.name,
-            "amount": str(expense.amount),
-            "date": expense.date.isoformat() if expense.date else None,
-        }, 200
+        return expense_serializer(expense), 200
 
 
 class ExpenseUpdate(Resource):
@@ -530,6 +1283,317 @@ class ExpenseDelete(Resource):
         return {"message": "Expense deleted successfully."}, 200
 
 
+# ``parse`` type-checks a JSON value and converts it for its column
+BatchField = namedtuple("BatchField", ["parse", "required", "default"])
+BatchField.__new__.__defaults__ = (False, None)
+
+BATCH_MAX_ITEMS = 1000
+
+
+def parse_string(value):
+    if not isinstance(value, str):
+        raise TypeError("Expected a string")
+    return value
+
+
+def parse_bool(value):
+    if not isinstance(value, bool):
+        raise TypeError("Expected a boolean")
+    return value
+
+
+def parse_id(value):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError("Expected an integer id")
+    return value
+
+
+def parse_iso_datetime(value):
+    return datetime.fromisoformat(value)
+
+
+def parse_strict_datetime(value):
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+AMOUNT_TYPE = Expense.__table__.c.amount.type
+
+
+def parse_amount(value):
+    """A finite Decimal that fits Expense.amount's Numeric(10, 2)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError("Expected a number")
+    amount = Decimal(str(value))
+    if not amount.is_finite():
+        raise ValueError("Expected a finite number")
+    quantized = amount.quantize(Decimal(1).scaleb(-AMOUNT_TYPE.scale))
+    if quantized != amount:
+        raise ValueError("Too many decimal places")
+    if len(quantized.as_tuple().digits) > AMOUNT_TYPE.precision:
+        raise ValueError("Amount out of range")
+    return quantized
+
+
+class BatchResource(Resource):
+    """Create, update or delete many rows of one event in a single transaction.
+
+    POST takes a list of new objects, PUT a list of partial objects that
+    each carry an "id", and DELETE a list of ids. Invalid items are reported
+    by their position in the list and skipped; the valid ones are written
+    with one executemany statement and committed once.
+    """
+
+    model = None
+    fields = {}
+
+    def _load_items(self):
+        items = request.get_json(silent=True)
+        if not isinstance(items, list) or not items:
+            return None, ({"error": "Expected a non-empty JSON list"}, 400)
+        if len(items) > BATCH_MAX_ITEMS:
+            return None, (
+                {"error": f"At most {BATCH_MAX_ITEMS} items per batch"},
+                400,
+            )
+        return items, None
+
+    def _parse_item(self, item, partial):
+        if not isinstance(item, dict):
+            raise ValueError("Expected a JSON object")
+        values = {}
+        for name, field in self.fields.items():
+            if name not in item or item[name] is None:
+                if field.required and not partial:
+                    raise ValueError(f"Missing required field: {name}")
+                if not partial and field.default is not None:
+                    values[name] = field.default
+                continue
+            try:
+                values[name] = field.parse(item[name])
+            except (TypeError, ValueError, ArithmeticError):
+                raise ValueError(f"Invalid value for field: {name}")
+        return values
+
+    def _existing_ids(self, event_id, ids):
+        return {
+            row_id
+            for (row_id,) in db.session.query(self.model.id).filter(
+                self.model.event_id == event_id, self.model.id.in_(ids)
+            )
+        }
+
+    def _budget_ids(self, rows=None, ids=None):
+        if not hasattr(self.model, "budget_id"):
+            return set()
+        if ids is not None:
+            return set(
+                db.session.scalars(
+                    db.select(self.model.budget_id).where(self.model.id.in_(ids))
+                )
+            )
+        return {row["budget_id"] for row in rows if row.get("budget_id")}
+
+    def _commit(self, event_id, budget_ids):
+        # Bulk statements bypass the unit of work, so the rollup hooks do not
+        # see them; refresh the affected stats explicitly in this transaction.
+        # Expenses also count toward the event owning their budget.
+        event_ids = {event_id}
+        if budget_ids:
+            event_ids.update(
+                db.session.scalars(
+                    db.select(Budget.event_id).where(Budget.id.in_(budget_ids))
+                )
+            )
+        refresh_event_stats(db.session.connection(), event_ids)
+        bump_event_versions(db.session.connection(), event_ids)
+        mark_events_changed(db.session, event_ids)
+        mark_changes_logged(db.session)
+        db.session.commit()
+
+    def _after_bulk_write(self, ids, rows=None):
+        """Maintain derived data of, or validate, the rows a bulk statement
+        just wrote (``rows``, in ``ids`` order) or deleted (``rows`` is
+        None). Returning an error response rolls the whole batch back."""
+        return None
+
+    def post(self, event_id):
+        Event.query.get_or_404(event_id)
+        items, error = self._load_items()
+        if error:
+            return error
+
+        rows, indexes, errors = [], [], []
+        for index, item in enumerate(items):
+            try:
+                values = self._parse_item(item, partial=False)
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            values["event_id"] = event_id
+            rows.append(values)
+            indexes.append(index)
+
+        if not rows:
+            return {"created": [], "errors": errors}, 400
+
+        ids = db.session.scalars(
+            insert(self.model).returning(
+                self.model.id, sort_by_parameter_order=True
+            ),
+            rows,
+        ).all()
+        error = self._after_bulk_write(ids, rows)
+        if error:
+            db.session.rollback()
+            return error
+        record_bulk_changes(
+            db.session.connection(), self.model, event_id, "insert", ids
+        )
+        self._commit(event_id, self._budget_ids(rows=rows))
+        return {
+            "created": [
+                {"index": index, "id": row_id} for index, row_id in zip(indexes, ids)
+            ],
+            "errors": errors,
+        }, 201
+
+    def put(self, event_id):
+        Event.query.get_or_404(event_id)
+        items, error = self._load_items()
+        if error:
+            return error
+
+        parsed, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                values = self._parse_item(item, partial=True)
+                row_id = parse_id(item["id"])
+            except KeyError:
+                errors.append({"index": index, "error": "Missing required field: id"})
+                continue
+            except (TypeError, ValueError) as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            if not values:
+                errors.append({"index": index, "error": "No updatable fields"})
+                continue
+            values["id"] = row_id
+            parsed.append((index, values))
+
+        existing = self._existing_ids(event_id, [values["id"] for _, values in parsed])
+        rows, updated = [], []
+        for index, values in parsed:
+            if values["id"] not in existing:
+                errors.append({"index": index, "error": "Not found in this event"})
+                continue
+            rows.append(values)
+            updated.append(values["id"])
+
+        if not rows:
+            return {"updated": [], "errors": errors}, 400
+
+        # Budgets the expenses move away from are affected as well
+        budget_ids = self._budget_ids(ids=updated) | self._budget_ids(rows=rows)
+        db.session.execute(update(self.model), rows)
+        error = self._after_bulk_write(updated, rows)
+        if error:
+            db.session.rollback()
+            return error
+        fields = {row["id"]: sorted(set(row) - {"id"}) for row in rows}
+        record_bulk_changes(
+            db.session.connection(), self.model, event_id, "update", updated, fields
+        )
+        self._commit(event_id, budget_ids)
+        errors.sort(key=lambda error: error["index"])
+        return {"updated": updated, "errors": errors}, 200
+
+    def delete(self, event_id):
+        Event.query.get_or_404(event_id)
+        items, error = self._load_items()
+        if error:
+            return error
+
+        ids, errors = [], []
+        for index, item in enumerate(items):
+            if isinstance(item, int) and not isinstance(item, bool):
+                ids.append(item)
+            else:
+                errors.append({"index": index, "error": "Expected an integer id"})
+
+        existing = self._existing_ids(event_id, ids)
+        errors.extend(
+            {"index": index, "error": "Not found in this event"}
+            for index, row_id in enumerate(items)
+            if row_id in ids and row_id not in existing
+        )
+        if not existing:
+            return {"deleted": [], "errors": errors}, 400
+
+        budget_ids = self._budget_ids(ids=existing)
+        db.session.query(self.model).filter(self.model.id.in_(existing)).delete(
+            synchronize_session=False
+        )
+        self._after_bulk_write(existing)
+        record_bulk_changes(
+            db.session.connection(), self.model, event_id, "delete", sorted(existing)
+        )
+        self._commit(event_id, budget_ids)
+        errors.sort(key=lambda error: error["index"])
+        return {"deleted": sorted(existing), "errors": errors}, 200
+
+
+class TaskBatch(BatchResource):
+    model = Task
+    fields = {
+        "title": BatchField(parse=parse_string, required=True),
+        "description": BatchField(parse=parse_string, default=""),
+        "deadline": BatchField(parse=parse_iso_datetime, required=True),
+        "priority": BatchField(parse=parse_string, default="Medium"),
+        "status": BatchField(parse=parse_string, default="Pending"),
+        "assigned_to": BatchField(parse=parse_id),
+        "dependency": BatchField(parse=parse_string, default=""),
+    }
+
+    def _after_bulk_write(self, ids, rows=None):
+        connection = db.session.connection()
+        if rows is None:
+            delete_edges(connection, ids)
+        else:
+            refresh_dependents(
+                connection,
+                [row_id for row_id, row in zip(ids, rows) if "status" in row],
+            )
+
+
+class ResourceBatch(BatchResource):
+    model = EventResource
+    fields = {
+        "name": BatchField(parse=parse_string, required=True),
+        "type": BatchField(parse=parse_string, required=True),
+        "availability": BatchField(parse=parse_bool, default=True),
+        "reservation_date": BatchField(parse=parse_strict_datetime),
+        "reservation_end": BatchField(parse=parse_strict_datetime),
+    }
+
+    def _after_bulk_write(self, ids, rows=None):
+        if rows is not None:
+            return booking_error(ids)
+
+
+class ExpenseBatch(BatchResource):
+    model = Expense
+    fields = {
+        "name": BatchField(parse=parse_string, required=True),
+        "amount": BatchField(parse=parse_amount, required=True),
+        "date": BatchField(parse=parse_date, required=True),
+        "budget_id": BatchField(parse=parse_id),
+    }
+
+
 class UpdateTaskStatus(Resource):
     def put(self):
         data = request.get_json()
@@ -578,77 +1642,313 @@ class CompleteTask(Resource):
             return {"error": "Database error: " + str(e)}, 500
 
 
+def dependencies_payload(task):
+    return {
+        "task_id": task.id,
+        "depends_on": sorted(link.depends_on_id for link in task.prerequisite_links),
+        "dependents": sorted(link.task_id for link in task.dependent_links),
+        "blocked_by": task.blocked_by,
+    }
+
+
+class TaskDependencies(Resource):
+    def get(self, event_id, task_id):
+        task = Task.query.filter_by(event_id=event_id, id=task_id).first_or_404()
+        return dependencies_payload(task), 200
+
+    def put(self, event_id, task_id):
+        task = Task.query.filter_by(event_id=event_id, id=task_id).first_or_404()
+        data = request.get_json(silent=True) or {}
+        depends_on = data.get("depends_on")
+        if not isinstance(depends_on, list) or not all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in depends_on
+        ):
+            return {"error": "depends_on must be a list of task ids"}, 400
+        depends_on = sorted(set(depends_on))
+
+        found = {
+            row_id
+            for (row_id,) in db.session.query(Task.id).filter(
+                Task.event_id == event_id, Task.id.in_(depends_on)
+            )
+        }
+        missing = [value for value in depends_on if value not in found]
+        if missing:
+            return {"error": "Tasks not found in this event", "missing": missing}, 400
+
+        _, edges = load_graph(db.session.connection(), event_id)
+        cycle = find_cycle(edges, task_id, depends_on)
+        if cycle:
+            return {"error": "Dependencies would create a cycle", "cycle": cycle}, 409
+
+        current = {link.depends_on_id: link for link in task.prerequisite_links}
+        task.prerequisite_links = [
+            current.get(value)
+            or TaskDependency(task_id=task_id, depends_on_id=value, event_id=event_id)
+            for value in depends_on
+        ]
+        db.session.commit()
+        return dependencies_payload(task), 200
+
+
+class TaskSchedule(Resource):
+    @cached_response
+    def get(self, event_id):
+        version = event_version(event_id)
+        if version is None:
+            return {"message": "Event not found"}, 404
+        tag = f"schedule-{event_id}-{version[0]}"
+        headers = conditional_headers(tag, version[1])
+        if is_not_modified(tag, version[1]):
+            return not_modified(headers)
+
+        tasks, edges = load_graph(db.session.connection(), event_id)
+        result = schedule(tasks, edges)
+        result["event_id"] = event_id
+        result["critical_path_length"] = len(result["critical_path"])
+        return result, 200, headers
+
+
+class ReadyTaskList(Resource):
+    @cached_response
+    def get(self, event_id):
+        headers = {}
+        version = event_version(event_id)
+        if version is not None:
+            tag = f"ready-{event_id}-{version[0]}"
+            headers = conditional_headers(tag, version[1])
+            if is_not_modified(tag, version[1]):
+                return not_modified(headers)
+        tasks = (
+            Task.query.filter(
+                Task.event_id == event_id,
+                Task.blocked_by == 0,
+                db.func.coalesce(Task.status, "") != COMPLETED,
+            )
+            .order_by(Task.deadline.is_(None), Task.deadline, Task.id)
+            .all()
+        )
+        return task_serializer.many(tasks), 200, headers
+
+
+DUE_TASKS_DEFAULT_LIMIT = 50
+DUE_TASKS_MAX_LIMIT = 500
+
+due_tasks_parser = reqparse.RequestParser()
+due_tasks_parser.add_argument("hours", type=float, location="args", default=24)
+due_tasks_parser.add_argument("from", type=parse_date_arg, location="args")
+due_tasks_parser.add_argument("cursor", type=str, location="args")
+due_tasks_parser.add_argument(
+    "limit", type=int, location="args", default=DUE_TASKS_DEFAULT_LIMIT
+)
+
+
+class DueTaskList(Resource):
+    """Open tasks of every event that are overdue or due within ``hours``.
+
+    Soonest deadline first, so overdue tasks lead; ``from`` bounds how far
+    back overdue tasks go. Not response-cached: the answer moves with time.
+    """
+
+    def get(self):
+        args = due_tasks_parser.parse_args()
+        if args["limit"] < 1 or args["hours"] < 0:
+            return {"message": "limit must be positive and hours not negative."}, 400
+        limit = min(args["limit"], DUE_TASKS_MAX_LIMIT)
+        after = None
+        if args["cursor"]:
+            try:
+                after = decode_cursor(args["cursor"])
+            except (ValueError, TypeError):
+                return {"message": "Invalid cursor."}, 400
+            if after[0] is None:
+                return {"message": "Invalid cursor."}, 400
+
+        now = utcnow()
+        until = now + timedelta(hours=args["hours"])
+        rows = due_tasks(db.session.connection(), until, args["from"], limit + 1, after)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].deadline, rows[-1].id)
+        return {
+            "as_of": now.isoformat(),
+            "until": until.isoformat(),
+            "tasks": [
+                dict(
+                    task_serializer(row),
+                    event_id=row.event_id,
+                    overdue=row.deadline < now,
+                )
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }, 200
+
+
+def task_completion_payload(event_id, total_tasks, completed_tasks):
+    if total_tasks > 0:
+        completion_percentage = (completed_tasks / total_tasks) * 100
+    else:
+        completion_percentage = 0
+
+    return {
+        "event_id": event_id,
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "completion_percentage": completion_percentage,
+    }
+
+
+def budget_report_payload(event_id, allocated_budget, total_spent_amount):
+    remaining_budget = allocated_budget - total_spent_amount
+
+    return {
+        "event_id": event_id,
+        "allocated_budget": float(allocated_budget),
+        "total_spent_amount": float(total_spent_amount),
+        "remaining_budget": float(remaining_budget),
+    }
+
+
+BATCH_MAX_IDS = 500
+
+
+def parse_id_list(value):
+    ids = [int(part) for part in value.split(",") if part.strip()]
+    if not ids:
+        raise ValueError("at least one id is required")
+    if len(ids) > BATCH_MAX_IDS:
+        raise ValueError(f"at most {BATCH_MAX_IDS} ids are allowed")
+    # Preserve the caller's order while dropping duplicates
+    return list(dict.fromkeys(ids))
+
+
+batch_ids_parser = reqparse.RequestParser()
+batch_ids_parser.add_argument(
+    "ids", type=parse_id_list, location="args", required=True
+)
+
+
+def event_stats_by_id(event_ids):
+    rows = EventStats.query.filter(EventStats.event_id.in_(event_ids)).all()
+    return {stats.event_id: stats for stats in rows}
+
+
+def completion_from_stats(event_id, stats):
+    if stats is None:
+        return task_completion_payload(event_id, 0, 0)
+    return task_completion_payload(event_id, stats.total_tasks, stats.completed_tasks)
+
+
 class CalculateTaskCompletion(Resource):
     def get(self, event_id):
-        total_tasks = Task.query.filter_by(event_id=event_id).count()
-        completed_tasks = Task.query.filter_by(
-            event_id=event_id, status="Completed"
-        ).count()
+        stats = db.session.get(EventStats, event_id)
+        return completion_from_stats(event_id, stats), 200
 
-        if total_tasks > 0:
-            completion_percentage = (completed_tasks / total_tasks) * 100
-        else:
-            completion_percentage = 0
 
+class BatchTaskCompletion(Resource):
+    def get(self):
+        event_ids = batch_ids_parser.parse_args()["ids"]
+        stats = event_stats_by_id(event_ids)
         return {
-            "event_id": event_id,
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "completion_percentage": completion_percentage,
+            "completion": [
+                completion_from_stats(event_id, stats.get(event_id))
+                for event_id in event_ids
+            ]
         }, 200
 
 
 class GenerateBudgetReport(Resource):
+    @cached_response
     def get(self, event_id):
-        budget = Budget.query.filter_by(event_id=event_id).first()
-        if not budget:
+        stats = db.session.get(EventStats, event_id)
+        if stats is None or stats.budget_id is None:
             return {"error": "Budget not found for the specified event"}, 404
 
-        expenses = Expense.query.filter_by(budget_id=budget.id).all()
-        total_spent_amount = sum(expense.amount for expense in expenses)
-        remaining_budget = budget.allocated_budget - total_spent_amount
+        return (
+            budget_report_payload(
+                event_id, stats.allocated_budget, stats.total_spent_amount
+            ),
+            200,
+        )
+
+
+class BatchBudgetReport(Resource):
+    def get(self):
+        event_ids = batch_ids_parser.parse_args()["ids"]
+        stats = event_stats_by_id(event_ids)
+        found = [
+            event_id
+            for event_id in event_ids
+            if event_id in stats and stats[event_id].budget_id is not None
+        ]
+        return {
+            "reports": [
+                budget_report_payload(
+                    event_id,
+                    stats[event_id].allocated_budget,
+                    stats[event_id].total_spent_amount,
+                )
+                for event_id in found
+            ],
+            "not_found": [event_id for event_id in event_ids if event_id not in found],
+        }, 200
+
+
+class EventStatsDetail(Resource):
+    def get(self, event_id):
+        stats = db.session.get(EventStats, event_id)
+        if stats is None:
+            return {"error": "Stats not found for the specified event"}, 404
 
         return {
             "event_id": event_id,
-            "allocated_budget": float(budget.allocated_budget),
-            "total_spent_amount": float(total_spent_amount),
-            "remaining_budget": float(remaining_budget),
+            "total_tasks": stats.total_tasks,
+            "completed_tasks": stats.completed_tasks,
+            "participant_count": stats.participant_count,
+            "allocated_budget": (
+                float(stats.allocated_budget)
+                if stats.allocated_budget is not None
+                else None
+            ),
+            "total_spent_amount": float(stats.total_spent_amount),
         }, 200
 
 
+# Each child collection is fetched with a single "WHERE event_id IN (...)"
+# statement, so the number of queries stays fixed however many rows exist.
+event_detail_load_options = (
+    selectinload(Event.tasks),
+    selectinload(Event.resources),
+    selectinload(Event.budgets),
+    selectinload(Event.expenses),
+    selectinload(Event.participants),
+)
+
+
 class EventWithDetails(Resource):
+    @cached_response
     def get(self, event_id):
-        # Fetch the event based on event_id
-        event = Event.query.filter_by(id=event_id).first()
+        version = event_version(event_id)
+        if version is None:
+            return {"message": "Event not found"}, 404
+        tag = f"event-detail-{event_id}-{version[0]}"
+        headers = conditional_headers(tag, version[1])
+        if is_not_modified(tag, version[1]):
+            return not_modified(headers)
+
+        event = (
+            Event.query.options(*event_detail_load_options)
+            .filter_by(id=event_id)
+            .first()
+        )
 
         if not event:
             return {"message": "Event not found"}, 404
 
-        # Serialize the event data
-        event_data = event.to_dict(
-            rules=("-user.password",)
-        )  # Exclude sensitive user info
-
-        # Fetch and serialize associated data
-        event_data["tasks"] = [
-            task.to_dict() for task in Task.query.filter_by(event_id=event.id)
-        ]
-        event_data["resources"] = [
-            resource.to_dict()
-            for resource in EventResource.query.filter_by(event_id=event.id)
-        ]
-        event_data["budgets"] = [
-            budget.to_dict() for budget in Budget.query.filter_by(event_id=event.id)
-        ]
-        event_data["expenses"] = [
-            expense.to_dict() for expense in Expense.query.filter_by(event_id=event.id)
-        ]
-        event_data["participants"] = [
-            participant.to_dict()
-            for participant in Participant.query.filter_by(event_id=event.id)
-        ]
-
-        return jsonify(event_data)
+        return serialize_event_details(event), 200, headers
 
 
 api.add_resource(EventWithDetails, "/event-detail/<int:event_id>")
@@ -656,7 +1956,20 @@ api.add_resource(UpdateTaskStatus, "/tasks/update-status")
 api.add_resource(CompleteTask, "/tasks/complete")
 api.add_resource(CalculateTaskCompletion, "/events/<int:event_id>/tasks/completion")
 api.add_resource(GenerateBudgetReport, "/events/<int:event_id>/budget/report")
+api.add_resource(BatchTaskCompletion, "/events/completion")
+api.add_resource(BatchBudgetReport, "/events/budget/report")
+api.add_resource(EventStatsDetail, "/events/<int:event_id>/stats")
+api.add_resource(
+    TaskDependencies, "/events/<int:event_id>/tasks/<int:task_id>/dependencies"
+)
+api.add_resource(TaskSchedule, "/events/<int:event_id>/tasks/schedule")
+api.add_resource(ReadyTaskList, "/events/<int:event_id>/tasks/ready")
+api.add_resource(DueTaskList, "/tasks/due")
+
 
+api.add_resource(TaskBatch, "/events/<int:event_id>/tasks:batch")
+api.add_resource(ResourceBatch, "/events/<int:event_id>/resources:batch")
+api.add_resource(ExpenseBatch, "/events/<int:event_id>/expenses:batch")
 
 api.add_resource(ExpenseCreate, "/events/<int:event_id>/expenses")
 api.add_resource(ExpenseList, "/events/<int:event_id>/expenses")
@@ -667,6 +1980,8 @@ api.add_resource(ExpenseDelete, "/events/<int:event_id>/expenses/<int:expense_id
 api.add_resource(ResourceDetail, "/events/<int:event_id>/resources/<int:resource_id>")
 api.add_resource(ResourceUpdate, "/events/<int:event_id>/resources/<int:resource_id>")
 api.add_resource(ResourceDelete, "/events/<int:event_id>/resources/<int:resource_id>")
+api.add_resource(ResourceAvailability, "/resources/availability")
+api.add_resource(SearchResource, "/search")
 
 api.add_resource(TaskDelete, "/events/<int:event_id>/tasks/<int:task_id>")
 api.add_resource(ResourceCreate, "/events/<int:event_id>/resources")
@@ -679,14 +1994,19 @@ api.add_resource(EventDelete, "/events/<int:event_id>")
 api.add_resource(TaskCreate, "/events/<int:event_id>/tasks")
 api.add_resource(EventCreate, "/events")
 api.add_resource(EventList, "/events")
+api.add_resource(EventCalendar, "/events/calendar")
 api.add_resource(EventDetail, "/events/<int:event_id>")
+api.add_resource(EventChangeStream, "/events/<int:event_id>/stream")
 api.add_resource(SignupResource, "/signup")
 api.add_resource(LoginResource, "/login")
 api.add_resource(LogoutResource, "/logout")
 api.add_resource(PublicResource, "/public")
 api.add_resource(AuthResource, "/auth")
 api.add_resource(CheckSessionResource, "/checksession")
+api.add_resource(DashboardResource, "/me/dashboard")
 api.add_resource(AssignTaskResource, "/tasks/assign")
+api.add_resource(CacheStatsResource, "/cache/stats")
+api.add_resource(MetricsResource, "/metrics")
 
 
 if __name__ == "__main__":
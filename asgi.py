@@ -0,0 +1,318 @@
+"""ASGI entry point serving the hot read endpoints on an async engine.
+
+Run alongside (or instead of) the WSGI ``app:app``:
+
+    gunicorn -w 4 -k uvicorn.workers.UvicornWorker asgi:application
+
+This needs the ``asgi`` packages of the Pipfile (``pipenv install --categories
+asgi``): ``uvicorn``, ``a2wsgi``, ``aiosqlite`` and ``greenlet``, which the
+async engine runs on (``asyncpg`` too for PostgreSQL). The event,
+event-detail, task, resource and expense reads below are answered by
+coroutines on SQLAlchemy's async engine, so a request waiting on the
+database holds no thread; the six queries behind /event-detail/<id> run
+concurrently on separate pooled connections. Every other request, including
+writes, logins and anything these handlers decline (404s, trailing-slash
+redirects), is passed to the Flask app on a thread pool and behaves exactly
+as under a WSGI server.
+
+The async reads keep the ETag/Last-Modified contract of the sync endpoints
+but bypass the response cache and the request metrics.
+
+Configuration:
+
+    ASYNC_DATABASE_URL   async URL (default derived from DATABASE_URL)
+    ASGI_WSGI_THREADS    threads running the Flask app (default 10)
+"""
+import asyncio
+import logging
+import os
+from datetime import timezone
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_date, parse_etags
+from werkzeug.routing import Map, Rule
+
+from app import app, conditional_headers, json_encoder, response_compression
+from compression import compress
+from database import register_sqlite_pragmas
+from models import Event, Task, EventResource, Budget, Expense, Participant
+from serializers import (
+    event_serializer,
+    task_serializer,
+    resource_serializer,
+    expense_serializer,
+    event_row_serializer,
+    task_row_serializer,
+    resource_row_serializer,
+    budget_row_serializer,
+    expense_row_serializer,
+    participant_row_serializer,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_uri(uri):
+    """Swap the sync driver of a database URL for its async counterpart."""
+    scheme, separator, rest = uri.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+
+app.config.setdefault(
+    "ASYNC_DATABASE_URL",
+    os.environ.get(
+        "ASYNC_DATABASE_URL",
+        async_database_uri(app.config["SQLALCHEMY_DATABASE_URI"]),
+    ),
+)
+app.config.setdefault(
+    "ASGI_WSGI_THREADS", int(os.environ.get("ASGI_WSGI_THREADS", 10))
+)
+
+engine = create_async_engine(
+    app.config["ASYNC_DATABASE_URL"], **app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+)
+register_sqlite_pragmas(engine.sync_engine, app.config)
+
+wsgi_application = WSGIMiddleware(app, workers=app.config["ASGI_WSGI_THREADS"])
+
+
+async def fetch_all(statement):
+    async with engine.connect() as connection:
+        return (await connection.execute(statement)).all()
+
+
+async def fetch_first(statement):
+    async with engine.connect() as connection:
+        return (await connection.execute(statement)).first()
+
+
+def event_version(event_id):
+    return fetch_first(
+        select(Event.version, Event.updated_at).where(Event.id == event_id)
+    )
+
+
+def is_not_modified(headers, tag, last_modified=None):
+    # Same precedence as app.is_not_modified, read from the ASGI headers
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return parse_etags(if_none_match).contains_weak(tag)
+    if_modified_since = parse_date(headers.get("if-modified-since"))
+    if last_modified is not None and if_modified_since:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return last_modified <= if_modified_since
+    return False
+
+
+def conditional(headers, tag, version):
+    """Return (headers, not_modified) for a versioned response."""
+    response_headers = conditional_headers(tag, version[1])
+    return response_headers, is_not_modified(headers, tag, version[1])
+
+
+# Each handler returns (status, payload, headers), or None to let the Flask
+# app answer the request instead.
+
+
+async def event_with_details(headers, event_id):
+    version = await event_version(event_id)
+    if version is None:
+        return 404, {"message": "Event not found"}, {}
+    response_headers, unchanged = conditional(
+        headers, f"event-detail-{event_id}-{version[0]}", version
+    )
+    if unchanged:
+        return 304, None, response_headers
+
+    event, tasks, resources, budgets, expenses, participants = await asyncio.gather(
+        fetch_first(select(Event.__table__).where(Event.id == event_id)),
+        *(
+            fetch_all(select(model.__table__).where(model.event_id == event_id))
+            for model in (Task, EventResource, Budget, Expense, Participant)
+        ),
+    )
+    if event is None:
+        return 404, {"message": "Event not found"}, {}
+
+    data = event_row_serializer(event)
+    data["tasks"] = task_row_serializer.many(tasks)
+    data["resources"] = resource_row_serializer.many(resources)
+    data["budgets"] = budget_row_serializer.many(budgets)
+    data["expenses"] = expense_row_serializer.many(expenses)
+    data["participants"] = participant_row_serializer.many(participants)
+    return 200, data, response_headers
+
+
+async def event_detail(headers, event_id):
+    version = await event_version(event_id)
+    if version is None:
+        return None
+    response_headers, unchanged = conditional(
+        headers, f"event-{event_id}-{version[0]}", version
+    )
+    if unchanged:
+        return 304, None, response_headers
+    event = await fetch_first(select(Event.__table__).where(Event.id == event_id))
+    if event is None:
+        return None
+    return 200, event_serializer(event), response_headers
+
+
+def child_list(model, serializer, tag_prefix=None):
+    """Handler listing an event's ``model`` rows, versioned when tagged."""
+
+    async def handler(headers, event_id):
+        response_headers = {}
+        if tag_prefix is not None:
+            version = await event_version(event_id)
+            if version is not None:
+                response_headers, unchanged = conditional(
+                    headers, f"{tag_prefix}-{event_id}-{version[0]}", version
+                )
+                if unchanged:
+                    return 304, None, response_headers
+        rows = await fetch_all(
+            select(model.__table__).where(model.event_id == event_id)
+        )
+        return 200, serializer.many(rows), response_headers
+
+    return handler
+
+
+def child_detail(model, serializer):
+    async def handler(headers, event_id, child_id):
+        row = await fetch_first(
+            select(model.__table__).where(
+                model.event_id == event_id, model.id == child_id
+            )
+        )
+        if row is None:
+            return None
+        return 200, serializer(row), {}
+
+    return handler
+
+
+url_map = Map(
+    [
+        Rule("/event-detail/<int:event_id>", endpoint=event_with_details),
+        Rule("/events/<int:event_id>", endpoint=event_detail),
+        Rule(
+            "/events/<int:event_id>/tasks",
+            endpoint=child_list(Task, task_serializer, "tasks"),
+        ),
+        Rule(
+            "/events/<int:event_id>/tasks/<int:child_id>",
+            endpoint=child_detail(Task, task_serializer),
+        ),
+        Rule(
+            "/events/<int:event_id>/resources",
+            endpoint=child_list(EventResource, resource_serializer, "resources"),
+        ),
+        Rule(
+            "/events/<int:event_id>/resources/<int:child_id>",
+            endpoint=child_detail(EventResource, resource_serializer),
+        ),
+        Rule(
+            "/events/<int:event_id>/expenses",
+            endpoint=child_list(Expense, expense_serializer),
+        ),
+        Rule(
+            "/events/<int:event_id>/expenses/<int:child_id>",
+            endpoint=child_detail(Expense, expense_serializer),
+        ),
+    ]
+)
+url_adapter = url_map.bind("localhost")
+
+
+def cors_headers(headers):
+    # What flask_cors adds to every response with its default settings
+    origin = headers.get("origin")
+    if origin is None:
+        return {"Access-Control-Allow-Origin": "*"}
+    return {"Access-Control-Allow-Origin": origin, "Vary": "Origin"}
+
+
+async def send_response(send, status, payload, headers, accept_encoding=None):
+    body = b""
+    if payload is not None:
+        # Same body and compression as the app's JSON responses
+        body = json_encoder.dumps(payload)
+        headers["Content-Type"] = "application/json"
+        if response_compression.enabled and status >= 200:
+            headers["Vary"] = ", ".join(
+                filter(None, (headers.get("Vary"), "Accept-Encoding"))
+            )
+            choice = response_compression.choose(accept_encoding)
+            if choice is not None and len(body) >= response_compression.min_size:
+                codec, level = choice
+                body = compress(codec, level, body)
+                headers["Content-Encoding"] = codec.name
+        headers["Content-Length"] = str(len(body))
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers.items()
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await engine.dispose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+
+    result = None
+    if scope["type"] == "http" and scope["method"] == "GET":
+        try:
+            handler, values = url_adapter.match(scope["path"], method="GET")
+        except HTTPException:
+            handler = None
+        if handler is not None:
+            headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in scope["headers"]
+            }
+            try:
+                result = await handler(headers, **values)
+            except Exception:
+                logger.exception("Exception on %s [GET]", scope["path"])
+                result = 500, {"message": "Internal Server Error"}, {}
+            if result is not None:
+                status, payload, response_headers = result
+                response_headers.update(cors_headers(headers))
+                return await send_response(
+                    send,
+                    status,
+                    payload,
+                    response_headers,
+                    headers.get("accept-encoding"),
+                )
+
+    return await wsgi_application(scope, receive, send)
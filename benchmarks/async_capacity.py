@@ -0,0 +1,162 @@
+"""Compare the concurrency capacity of sync gunicorn workers and the ASGI app.
+
+Run from the project root:
+
+    python -m benchmarks.async_capacity --workers 2 --levels 1,8,32,128
+
+Both servers are gunicorn with the same number of worker processes, against
+one SQLite file seeded by ``seed.generate``: sync workers serving ``app:app``
+and uvicorn workers serving ``asgi:application``. For each client
+concurrency level the request mix of ``benchmarks.load_test`` (by default
+only /event-detail/<id>) runs for ``--seconds`` and throughput, errors and
+latency percentiles are reported side by side. A sync worker serves one
+request at a time, so past ``--workers`` concurrent clients requests queue
+in the listen backlog; the async workers keep accepting them while earlier
+ones wait on the database. The response cache is disabled for both.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import date
+
+from benchmarks.load_test import client, parse_mix, summarize
+from seed import add_dataset_arguments
+
+SERVERS = {
+    "sync": lambda port, workers: [
+        "gunicorn",
+        "--workers",
+        str(workers),
+        "--worker-class",
+        "sync",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--log-level",
+        "warning",
+        "app:app",
+    ],
+    "async": lambda port, workers: [
+        "gunicorn",
+        "--workers",
+        str(workers),
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--log-level",
+        "warning",
+        "asgi:application",
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not listen on port {port} within {timeout}s")
+
+
+def seed_database(args, path):
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(args.bcrypt_rounds)
+
+    from app import app
+    from models import db
+    from seed import generate
+
+    with app.app_context():
+        db.create_all()
+        generate(db.engine, args)
+        db.engine.dispose()
+
+
+def run_level(url, args, concurrency):
+    record_after = time.perf_counter() + args.warmup
+    deadline = record_after + args.seconds
+    results = [None] * concurrency
+    threads = [
+        threading.Thread(
+            target=client, args=(i, url, args, deadline, record_after, results)
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(results, args.mix, args.seconds)["total"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", default="sync,async")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument(
+        "--levels",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32, 128],
+        help="comma-separated client concurrency levels",
+    )
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("detail=1"))
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--warmup", type=float, default=1)
+    add_dataset_arguments(parser)
+    parser.set_defaults(
+        users=200,
+        events=1000,
+        tasks_per_event=20,
+        expenses_per_event=10,
+        participants_per_event=10,
+        start=date(2024, 1, 1),
+        bcrypt_rounds=4,
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"seeding {args.events} events...", flush=True)
+        seed_database(args, os.path.join(directory, "capacity.db"))
+        environment = dict(os.environ, RESPONSE_CACHE_URL="null://")
+
+        print(
+            f"{'server':8}{'clients':>8}{'req/s':>10}{'errors':>8}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for name in args.servers.split(","):
+            port = free_port()
+            process = subprocess.Popen(
+                SERVERS[name](port, args.workers), env=environment
+            )
+            try:
+                wait_for_port(port, process)
+                for concurrency in args.levels:
+                    row = run_level(f"http://127.0.0.1:{port}", args, concurrency)
+                    print(
+                        f"{name:8}{concurrency:8d}{row['rps']:10.1f}"
+                        f"{row['errors']:8d}{row['p50_ms']:10.2f}"
+                        f"{row['p95_ms']:10.2f}{row['p99_ms']:10.2f}",
+                        flush=True,
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
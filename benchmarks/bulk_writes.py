@@ -0,0 +1,74 @@
+"""Compare single-item and batch task creation throughput.
+
+Run from the project root:
+
+    python -m benchmarks.bulk_writes --tasks 500
+
+Both paths run against a fresh file-backed SQLite database, so every
+commit pays for its journal sync as it would in production.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from flask import Flask
+from flask_restful import Api
+
+from models import db, Event
+from app import TaskCreate, TaskBatch
+
+
+def create_bench_app(path):
+    bench_app = Flask(__name__)
+    bench_app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(bench_app)
+    bench_api = Api(bench_app)
+    bench_api.add_resource(TaskCreate, "/events/<int:event_id>/tasks")
+    bench_api.add_resource(TaskBatch, "/events/<int:event_id>/tasks:batch")
+    return bench_app
+
+
+def task_payload(i):
+    return {
+        "title": f"Task {i}",
+        "description": "Imported from event plan",
+        "deadline": "2024-06-01T09:00:00",
+        "priority": "Medium",
+        "status": "Pending",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_app = create_bench_app(os.path.join(directory, "bench.db"))
+        client = bench_app.test_client()
+        with bench_app.app_context():
+            db.create_all()
+            db.session.add_all([Event(title="Single"), Event(title="Batch")])
+            db.session.commit()
+
+        payloads = [task_payload(i) for i in range(args.tasks)]
+
+        start = time.perf_counter()
+        for payload in payloads:
+            assert client.post("/events/1/tasks", json=payload).status_code == 201
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.post("/events/2/tasks:batch", json=payloads)
+        batch = time.perf_counter() - start
+        assert response.status_code == 201 and not response.json["errors"]
+
+    print(f"tasks: {args.tasks}")
+    print(f"single: {single:7.3f} s  {args.tasks / single:9.0f} tasks/s")
+    print(f"batch:  {batch:7.3f} s  {args.tasks / batch:9.0f} tasks/s")
+    print(f"speedup: {single / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Compare the legacy and eager-loaded /event-detail/<id> code paths.
+
+Run from the project root:
+
+    python -m benchmarks.event_detail --children 5000 --repeat 20
+
+Both variants run against the same in-memory SQLite database. The legacy
+variant is the original six ``filter_by`` queries plus ``to_dict()`` per row,
+leaving out the columns added since, which the endpoint does not return.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import event as sa_event
+
+from models import db, Event, Task, EventResource, Budget, Expense, Participant
+from serializers import serialize_event_details
+from app import event_detail_load_options
+
+LEGACY_EVENT_RULES = ("-user.password", "-version", "-updated_at", "-starts_at")
+LEGACY_TASK_RULES = ("-blocked_by",)
+
+
+def create_bench_app():
+    bench_app = Flask(__name__)
+    bench_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(bench_app)
+    return bench_app
+
+
+def seed(children):
+    event = Event(
+        title="Benchmark event",
+        date=datetime(2024, 1, 1, 9, 0),
+        location="Hall",
+        description="Synthetic event",
+        category="Bench",
+    )
+    db.session.add(event)
+    db.session.flush()
+    now = datetime(2024, 1, 1)
+    budget = Budget(event_id=event.id, allocated_budget=100000)
+    db.session.add(budget)
+    db.session.flush()
+    db.session.bulk_insert_mappings(
+        Task,
+        [
+            {
+                "event_id": event.id,
+                "title": f"Task {i}",
+                "description": "Synthetic task",
+                "deadline": now + timedelta(hours=i),
+                "priority": "Medium",
+                "status": "Completed" if i % 3 == 0 else "Pending",
+            }
+            for i in range(children)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        EventResource,
+        [
+            {
+                "event_id": event.id,
+                "name": f"Resource {i}",
+                "type": "Equipment",
+                "availability": True,
+                "reservation_date": now,
+            }
+            for i in range(children)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        Expense,
+        [
+            {
+                "event_id": event.id,
+                "budget_id": budget.id,
+                "name": f"Expense {i}",
+                "amount": 10,
+                "date": now,
+            }
+            for i in range(children)
+        ],
+    )
+    db.session.bulk_insert_mappings(
+        Participant,
+        [
+            {"event_id": event.id, "status": "Confirmed", "role": "Attendee"}
+            for _ in range(children)
+        ],
+    )
+    db.session.commit()
+    return event.id
+
+
+def legacy_event_details(event_id):
+    event = Event.query.filter_by(id=event_id).first()
+    event_data = event.to_dict(rules=LEGACY_EVENT_RULES)
+    event_data["tasks"] = [
+        task.to_dict(rules=LEGACY_TASK_RULES)
+        for task in Task.query.filter_by(event_id=event.id)
+    ]
+    event_data["resources"] = [
+        resource.to_dict()
+        for resource in EventResource.query.filter_by(event_id=event.id)
+    ]
+    event_data["budgets"] = [
+        budget.to_dict() for budget in Budget.query.filter_by(event_id=event.id)
+    ]
+    event_data["expenses"] = [
+        expense.to_dict() for expense in Expense.query.filter_by(event_id=event.id)
+    ]
+    event_data["participants"] = [
+        participant.to_dict()
+        for participant in Participant.query.filter_by(event_id=event.id)
+    ]
+    return event_data
+
+
+def eager_event_details(event_id):
+    event = (
+        Event.query.options(*event_detail_load_options).filter_by(id=event_id).first()
+    )
+    return serialize_event_details(event)
+
+
+def measure(func, event_id, repeat):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    engine = db.engine
+    sa_event.listen(engine, "before_cursor_execute", count)
+    timings = []
+    try:
+        for _ in range(repeat):
+            db.session.expunge_all()
+            start = time.perf_counter()
+            func(event_id)
+            timings.append(time.perf_counter() - start)
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", count)
+    timings.sort()
+    return timings[len(timings) // 2], len(statements) // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    bench_app = create_bench_app()
+    with bench_app.app_context():
+        db.create_all()
+        event_id = seed(args.children)
+
+        legacy = measure(legacy_event_details, event_id, args.repeat)
+        eager = measure(eager_event_details, event_id, args.repeat)
+        assert legacy_event_details(event_id) == eager_event_details(event_id)
+
+    print(f"children per collection: {args.children}")
+    print(f"legacy: {legacy[0] * 1000:8.1f} ms median, {legacy[1]} statements")
+    print(f"eager:  {eager[0] * 1000:8.1f} ms median, {eager[1]} statements")
+    print(f"speedup: {legacy[0] / eager[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare the stdlib and orjson API encoders on large task and expense lists.
+
+Run from the project root:
+
+    python -m benchmarks.json_encoding --rows 10000
+
+"json.dumps" is the previous response path: payload serializers formatting
+datetimes in Python, then the stdlib encoder. "orjson" serializes with the
+native payload serializers and lets orjson format datetimes and Decimals.
+"cache hit" compares re-encoding a cached payload, as the response cache
+used to, with embedding its stored encoding as a fragment.
+"""
+import argparse
+import json
+import timeit
+
+from benchmarks.serializers import build_rows
+from representations import create_encoder
+from serializers import Serializer, task_serializer, expense_serializer
+
+
+def report(label, baseline, optimized, rows):
+    print(
+        f"{label:24} {baseline * 1e6 / rows:7.2f} us/row -> "
+        f"{optimized * 1e6 / rows:5.2f} us/row  ({baseline / optimized:5.1f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encoder = create_encoder("orjson")
+    _, tasks, expenses = build_rows(args.rows)
+
+    def best(func):
+        return min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+    for label, rows, serializer in (
+        ("tasks", tasks, task_serializer),
+        ("expenses", expenses, expense_serializer),
+    ):
+        formatted = Serializer(serializer.fields)
+        before = (json.dumps(formatted.many(rows)) + "\n").encode("utf-8")
+        after = encoder.dumps(serializer.many(rows))
+        assert json.loads(before) == json.loads(after)
+
+        report(
+            f"{label} json.dumps",
+            best(lambda: (json.dumps(formatted.many(rows)) + "\n").encode("utf-8")),
+            best(lambda: encoder.dumps(serializer.many(rows))),
+            args.rows,
+        )
+
+        cached_data = formatted.many(rows)
+        cached_body = encoder.encode(serializer.many(rows)).decode("utf-8")
+        report(
+            f"{label} cache hit",
+            best(lambda: (json.dumps(cached_data) + "\n").encode("utf-8")),
+            best(lambda: encoder.dumps(encoder.fragment(cached_body))),
+            args.rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Drive a realistic request mix and report latency percentiles per route.
+
+Run from the project root:
+
+    python -m benchmarks.load_test --events 2000 --concurrency 16 --seconds 20
+
+By default the app is started on a local threaded server against a fresh
+SQLite file filled by ``seed.generate`` from ``--seed``, so two
+runs with the same arguments see the same data and the same request
+sequence per client. ``--url`` targets a server that is already running
+(e.g. gunicorn) instead; it must hold data shaped like the synthetic one.
+
+The mix is a comma-separated list of ``scenario=weight`` pairs drawn from
+login, list, detail, task_update and expense_create. Results are printed
+per scenario; ``--json`` saves them, and ``--baseline`` compares p95
+latencies with a saved run and exits 1 when any scenario regressed by more
+than ``--tolerance``.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from urllib.parse import urlsplit
+
+from seed import add_dataset_arguments, TASK_STATUSES, EVENT_KINDS
+
+DEFAULT_MIX = "login=1,list=4,detail=4,task_update=2,expense_create=1"
+CATEGORIES = sorted({category for _, category, _ in EVENT_KINDS})
+
+
+def start_local_server(args, directory):
+    """Seed a fresh database, serve the app on a free port and return its URL."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'load.db')}"
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(args.bcrypt_rounds)
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_URL"] = "null://"
+
+    from werkzeug.serving import make_server
+
+    from app import app
+    from models import db
+    from seed import generate
+
+    with app.app_context():
+        db.create_all()
+        generate(db.engine, args)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# Each scenario returns (method, path, JSON body or None)
+
+def login(rng, args):
+    user = rng.randint(1, args.users)
+    password = f"password{(user - 1) % args.password_pool + 1}"
+    return "POST", "/login", {"username": f"user{user}", "password": password}
+
+
+def list_events(rng, args):
+    path = "/events?limit=50"
+    if rng.random() < 0.5:
+        path += "&category=" + rng.choice(CATEGORIES)
+    return "GET", path, None
+
+
+def event_detail(rng, args):
+    return "GET", f"/event-detail/{rng.randint(1, args.events)}", None
+
+
+def task_update(rng, args):
+    task_id = rng.randint(1, args.events * args.tasks_per_event)
+    return (
+        "PUT",
+        "/tasks/update-status",
+        {"task_id": task_id, "status": rng.choice(TASK_STATUSES)},
+    )
+
+
+def expense_create(rng, args):
+    payload = {"name": "Load-test expense", "amount": 25, "date": "2024-06-01"}
+    return "POST", f"/events/{rng.randint(1, args.events)}/expenses", payload
+
+
+SCENARIOS = {
+    "login": login,
+    "list": list_events,
+    "detail": event_detail,
+    "task_update": task_update,
+    "expense_create": expense_create,
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def client(index, url, args, deadline, record_after, results):
+    rng = random.Random(args.seed * 1000 + index)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        name = rng.choices(names, weights)[0]
+        method, path, body = SCENARIOS[name](rng, args)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        started = time.perf_counter()
+        try:
+            connection.request(
+                method,
+                path,
+                body=json.dumps(body) if body is not None else None,
+                headers=headers,
+            )
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            ok = False
+        elapsed = time.perf_counter() - started
+        if started >= record_after:
+            if ok:
+                samples[name].append(elapsed)
+            else:
+                errors[name] += 1
+    connection.close()
+    results[index] = (samples, errors)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(results, mix, seconds):
+    report = {}
+    for name in [*mix, "total"]:
+        values = []
+        errors = 0
+        for samples, failed in results:
+            for scenario in mix if name == "total" else (name,):
+                values.extend(samples[scenario])
+                errors += failed[scenario]
+        values.sort()
+        report[name] = {
+            "requests": len(values),
+            "errors": errors,
+            "rps": len(values) / seconds,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+        }
+    return report
+
+
+def print_report(report):
+    print(
+        f"{'scenario':16}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for name, row in report.items():
+        print(
+            f"{name:16}{row['requests']:10d}{row['errors']:8d}{row['rps']:10.1f}"
+            f"{row['p50_ms']:10.2f}{row['p95_ms']:10.2f}{row['p99_ms']:10.2f}"
+        )
+
+
+def compare(report, baseline, tolerance):
+    regressions = []
+    for name, row in report.items():
+        before = baseline.get(name)
+        if before and before["p95_ms"] and row["requests"]:
+            change = row["p95_ms"] / before["p95_ms"] - 1
+            if change > tolerance:
+                regressions.append(
+                    f"{name}: p95 {before['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms "
+                    f"(+{change:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="target a running server instead")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    add_dataset_arguments(parser)
+    parser.set_defaults(
+        users=200,
+        events=1000,
+        tasks_per_event=20,
+        expenses_per_event=10,
+        participants_per_event=10,
+        start=date(2024, 1, 1),
+        bcrypt_rounds=4,
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="disable the response cache"
+    )
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare p95 with a saved --json report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        url = args.url
+        if url is None:
+            print(f"seeding {args.events} events...", flush=True)
+            server, url = start_local_server(args, directory)
+
+        print(
+            f"{url} concurrency={args.concurrency} seconds={args.seconds} "
+            f"warmup={args.warmup} seed={args.seed}"
+        )
+        record_after = time.perf_counter() + args.warmup
+        deadline = record_after + args.seconds
+        results = [None] * args.concurrency
+        threads = [
+            threading.Thread(
+                target=client, args=(i, url, args, deadline, record_after, results)
+            )
+            for i in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if server is not None:
+            server.shutdown()
+
+    report = summarize(results, args.mix, args.seconds)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as saved:
+            regressions = compare(report, json.load(saved), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
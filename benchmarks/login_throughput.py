@@ -0,0 +1,77 @@
+"""Measure password checks per second through PasswordHasher.
+
+Run from the project root:
+
+    python -m benchmarks.login_throughput --rounds 10 --threads 16 --seconds 5
+
+Request threads call ``check_password`` concurrently, as gunicorn threads
+would during a login burst. The run is repeated with hashing inline on the
+request thread and on the process pool. Checks rejected with 429-style
+back-pressure are counted separately.
+"""
+import argparse
+import os
+import threading
+import time
+
+from flask import Flask
+
+from hashing import PasswordHasher, HashingPoolSaturated, _hash_password
+
+
+def run(workers, args, pw_hash):
+    bench_app = Flask(__name__)
+    bench_app.config["BCRYPT_LOG_ROUNDS"] = args.rounds
+    bench_app.config["HASH_POOL_WORKERS"] = workers
+    bench_app.config["HASH_POOL_MAX_PENDING"] = args.max_pending or args.threads
+    bench_app.config["HASH_POOL_TIMEOUT"] = 0.05
+    hasher = PasswordHasher(bench_app)
+    # Warm the pool so process start-up is not measured
+    hasher.check_password(pw_hash, "password1")
+
+    counts = {"ok": 0, "rejected": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            try:
+                hasher.check_password(pw_hash, "password1")
+                key = "ok"
+            except HashingPoolSaturated:
+                key = "rejected"
+                time.sleep(0.01)
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    hasher.shutdown()
+    return counts["ok"] / args.seconds, counts["rejected"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, default=0)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    pw_hash = _hash_password("password1", args.rounds)
+    cores = os.cpu_count() or 1
+    print(f"bcrypt rounds={args.rounds} threads={args.threads} cores={cores}")
+    for label, workers in (("inline", 0), (f"pool x{args.workers}", args.workers)):
+        rate, rejected = run(workers, args, pw_hash)
+        print(
+            f"{label:10} {rate:8.1f} logins/s  {rate / cores:6.1f} per core  "
+            f"{rejected} rejected"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Check that the queries of the hot endpoints are served by an index.
+
+Run from the project root:
+
+    python -m benchmarks.query_plans [--verbose]
+
+A temporary SQLite database is built with the migrations, as ``flask db
+upgrade`` builds it, so the indexes and full-text tables checked are the
+ones a deployment gets, and is filled with a small synthetic dataset. Each
+request below then goes through the app itself, and every SELECT it issues
+is recorded and passed, with its parameters, through SQLite's ``EXPLAIN
+QUERY PLAN``; the queries checked are the ones the endpoints build, however
+they change. A plan step that scans a table without an index, or sorts
+through a temporary b-tree, is reported and makes the command exit
+non-zero, so it can be wired into CI. The few requests whose sorts are
+bounded by design (one event's tasks, one page of search matches) are
+listed in BOUNDED_SORTS; their table scans still fail.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from sqlalchemy import event as sa_event
+
+SEED_ARGS = [
+    "--users", "20",
+    "--events", "40",
+    "--password-pool", "1",
+    "--bcrypt-rounds", "4",
+]  # fmt: skip
+
+# Requests allowed to sort through a temporary b-tree, and why that is cheap
+BOUNDED_SORTS = {
+    "TaskSchedule": "one event's tasks and edges, in id order",
+    "ReadyTaskList": "one event's ready tasks, in deadline order",
+    "EventCalendar counts": "one row per bucket of the requested range",
+    "Search": "the full-text matches, ranked by bm25",
+    "ResourceAvailability": "the distinct names of one resource type",
+    "Dashboard": "one user's participations, in event date order",
+}
+
+
+def hot_requests(app, client, headers):
+    """Return (name, call) pairs; each call makes the requests to check."""
+    cursor = client.get("/events?limit=5").headers["X-Next-Cursor"]
+    scheduler = app.extensions["reminders"]
+
+    def get(path, **kwargs):
+        return lambda: client.get(path, **kwargs)
+
+    return [
+        ("EventList page", get("/events")),
+        ("EventList by category", get("/events?category=Social")),
+        ("EventList keyset page", get(f"/events?limit=5&cursor={cursor}")),
+        ("EventList by owner", get("/events?user_id=1")),
+        ("EventList date range", get("/events?from=2024-01-01&to=2030-12-31")),
+        ("EventDetail", get("/events/1")),
+        ("EventWithDetails", get("/event-detail/1")),
+        ("TaskList", get("/events/1/tasks")),
+        ("TaskDetail", get("/events/1/tasks/1")),
+        ("ResourceList", get("/events/1/resources")),
+        ("ExpenseList", get("/events/1/expenses")),
+        ("CalculateTaskCompletion", get("/events/1/tasks/completion")),
+        ("GenerateBudgetReport", get("/events/1/budget/report")),
+        ("BatchTaskCompletion", get("/events/completion?ids=1,2,3")),
+        ("BatchBudgetReport", get("/events/budget/report?ids=1,2,3")),
+        ("EventStatsDetail", get("/events/1/stats")),
+        ("TaskSchedule", get("/events/1/tasks/schedule")),
+        ("ReadyTaskList", get("/events/1/tasks/ready")),
+        ("DueTaskList", get("/tasks/due?hours=720")),
+        ("EventCalendar", get("/events/calendar?from=2024-01-01&to=2024-12-31")),
+        (
+            "EventCalendar counts",
+            get("/events/calendar?from=2024-01-01&to=2030-12-31&counts=true"),
+        ),
+        ("Search", get("/search?q=conference")),
+        (
+            "ResourceAvailability",
+            get(
+                "/resources/availability?type=Equipment"
+                "&from=2024-01-01T09:00:00&to=2024-01-01T17:00:00"
+            ),
+        ),
+        ("Dashboard", get("/me/dashboard", headers=headers)),
+        ("CheckSession", get("/checksession", headers=headers)),
+        ("EventChangeStream", get("/events/1/stream?last_event_id=0")),
+        ("Reminder tick", scheduler.tick),
+    ]
+
+
+def plan_problems(plan, tables, allow_sorts=False):
+    problems = []
+    for step in plan:
+        if step.startswith("SCAN") and "USING" not in step:
+            # Scans of subqueries and full-text tables are not table scans
+            if step.split()[1] in tables and "VIRTUAL TABLE" not in step:
+                problems.append(step)
+        elif "USE TEMP B-TREE" in step and not allow_sorts:
+            problems.append(step)
+    return problems
+
+
+def explain(connection, statement, parameters):
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Read by app.py at import time
+        os.environ["DATABASE_URL"] = f"sqlite:///{directory}/plans.db"
+        os.environ["RESPONSE_CACHE_URL"] = "null://"
+        os.environ["USER_CACHE_URL"] = "null://"
+        os.environ["CHANGE_STREAM_MAX_SECONDS"] = "0.1"
+        os.environ["CHANGE_STREAM_POLL_INTERVAL"] = "0.05"
+        return check(options.verbose)
+
+
+def check(verbose):
+    from flask_jwt_extended import create_access_token
+    from flask_migrate import upgrade
+
+    from app import app, db
+    from models import User
+    from seed import add_dataset_arguments, generate
+
+    seed_parser = argparse.ArgumentParser()
+    add_dataset_arguments(seed_parser)
+
+    with app.app_context():
+        upgrade()
+        generate(db.engine, seed_parser.parse_args(SEED_ARGS), echo=lambda *a, **k: 0)
+        token = create_access_token(identity=db.session.get(User, 1).username)
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    tables = set(db.metadata.tables)
+    failures = 0
+    with app.app_context():
+        requests = hot_requests(app, client, headers)
+        sa_event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            for name, call in requests:
+                statements.clear()
+                response = call()
+                checked = dict(statements)
+                problems = []
+                status_code = getattr(response, "status_code", 200)
+                if status_code >= 400:
+                    problems.append(f"answered {status_code}")
+                with db.engine.connect() as connection:
+                    for statement, parameters in checked.items():
+                        plan = explain(connection, statement, parameters)
+                        bad = plan_problems(plan, tables, name in BOUNDED_SORTS)
+                        if bad or verbose:
+                            print(f"      {' '.join(statement.split())}")
+                            print(f"        {'; '.join(plan)}")
+                        problems.extend(bad)
+                status = "FAIL" if problems else "ok"
+                note = f"; sorts {BOUNDED_SORTS[name]}" if name in BOUNDED_SORTS else ""
+                print(f"{status:4}  {name} ({len(checked)} queries{note})")
+                for problem in problems:
+                    print(f"        {problem}")
+                failures += bool(problems)
+        finally:
+            sa_event.remove(db.engine, "before_cursor_execute", record)
+
+    if failures:
+        print(f"{failures} request{'' if failures == 1 else 's'} not served by indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
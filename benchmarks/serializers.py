@@ -0,0 +1,111 @@
+"""Microbenchmark the compiled serializers against to_dict() and marshal.
+
+Run from the project root:
+
+    python -m benchmarks.serializers --rows 10000
+
+Rows are transient model instances, so only serialization is measured.
+"""
+import argparse
+import timeit
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from flask_restful import marshal
+
+from models import Event, Task, Expense
+from serializers import (
+    event_serializer,
+    task_row_serializer,
+    expense_row_serializer,
+)
+from app import event_fields
+
+# to_dict() also emits the blocked_by counter, which the row serializer skips
+LEGACY_TASK_RULES = ("-blocked_by",)
+
+
+def build_rows(count):
+    start = datetime(2024, 1, 1, 9, 0)
+    events = [
+        Event(
+            id=i,
+            title=f"Event {i}",
+            date=start + timedelta(days=i % 365),
+            time=time(9, 30),
+            location="Hall",
+            description="Synthetic event",
+            category="Bench",
+        )
+        for i in range(count)
+    ]
+    tasks = [
+        Task(
+            id=i,
+            event_id=i % 100,
+            title=f"Task {i}",
+            description="Synthetic task",
+            deadline=start + timedelta(hours=i),
+            priority="Medium",
+            status="Pending",
+        )
+        for i in range(count)
+    ]
+    expenses = [
+        Expense(
+            id=i,
+            event_id=i % 100,
+            budget_id=1,
+            name=f"Expense {i}",
+            amount=Decimal("12.50"),
+            date=start,
+        )
+        for i in range(count)
+    ]
+    return events, tasks, expenses
+
+
+def report(label, baseline, compiled, rows):
+    print(
+        f"{label:28} {baseline * 1e6 / rows:7.2f} us/row -> "
+        f"{compiled * 1e6 / rows:5.2f} us/row  ({baseline / compiled:5.1f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    events, tasks, expenses = build_rows(args.rows)
+    assert [
+        task.to_dict(rules=LEGACY_TASK_RULES) for task in tasks[:10]
+    ] == task_row_serializer.many(tasks[:10])
+    assert marshal(events[:10], event_fields) == event_serializer.many(events[:10])
+
+    def best(func):
+        return min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+    report(
+        "Task to_dict()",
+        best(lambda: [task.to_dict(rules=LEGACY_TASK_RULES) for task in tasks]),
+        best(lambda: task_row_serializer.many(tasks)),
+        args.rows,
+    )
+    report(
+        "Expense to_dict()",
+        best(lambda: [expense.to_dict() for expense in expenses]),
+        best(lambda: expense_row_serializer.many(expenses)),
+        args.rows,
+    )
+    report(
+        "Event marshal(event_fields)",
+        best(lambda: marshal(events, event_fields)),
+        best(lambda: event_serializer.many(events)),
+        args.rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare SQLite throughput with default settings and the tuned profile.
+
+Run from the project root:
+
+    python -m benchmarks.sqlite_concurrency --workers 8 --seconds 5 --writes 0.2
+
+Each worker process opens its own engine, as a gunicorn worker would, and
+runs a read/write mix against a shared file database: reads count an
+event's tasks through the (event_id, status) index, writes insert a task
+and commit.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from models import db, Event, Task
+from database import DEFAULTS, register_sqlite_pragmas
+
+EVENTS = 100
+
+
+def setup(path):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Event), [{"title": f"Event {i}"} for i in range(EVENTS)]
+        )
+        connection.execute(
+            insert(Task),
+            [
+                {"event_id": i % EVENTS + 1, "title": f"Task {i}", "status": "Pending"}
+                for i in range(EVENTS * 50)
+            ],
+        )
+    engine.dispose()
+
+
+def worker(path, tuned, seconds, write_ratio, results):
+    engine = create_engine(f"sqlite:///{path}")
+    if tuned:
+        register_sqlite_pragmas(engine, DEFAULTS)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    rng = random.Random(os.getpid())
+    deadline = time.perf_counter() + seconds
+    count_tasks = select(func.count(Task.id))
+    with engine.connect() as connection:
+        while time.perf_counter() < deadline:
+            event_id = rng.randint(1, EVENTS)
+            try:
+                if rng.random() < write_ratio:
+                    connection.execute(
+                        insert(Task).values(
+                            event_id=event_id,
+                            title="Concurrent task",
+                            status="Pending",
+                            deadline=datetime.now(),
+                        )
+                    )
+                    connection.commit()
+                    counts["writes"] += 1
+                else:
+                    connection.execute(
+                        count_tasks.where(Task.event_id == event_id)
+                    ).scalar()
+                    connection.rollback()
+                    counts["reads"] += 1
+            except OperationalError:
+                connection.rollback()
+                counts["errors"] += 1
+    engine.dispose()
+    results.put(counts)
+
+
+def run(tuned, args):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        setup(path)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=worker, args=(path, tuned, args.seconds, args.writes, results)
+            )
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = {"reads": 0, "writes": 0, "errors": 0}
+        for _ in processes:
+            for key, value in results.get().items():
+                totals[key] += value
+        for process in processes:
+            process.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writes", type=float, default=0.2, help="write ratio")
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} seconds={args.seconds} write ratio={args.writes}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        totals = run(tuned, args)
+        print(
+            f"{label:8} {totals['reads'] / args.seconds:9.0f} reads/s "
+            f"{totals['writes'] / args.seconds:8.0f} writes/s "
+            f"{totals['errors']} lock errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Small key/value caches used by the API.
+
+``create_cache`` picks a backend from a URL:
+
+    memory://             in-process LRU, bounded by ``maxsize``
+    null://               caches nothing, to switch a cache off
+    local://              RedisCache over LocalRedis, a single-process
+                          stand-in with the subset of the redis-py API we use
+    redis://host:port/0   RedisCache over a real server (needs ``redis``)
+
+Every backend stores JSON-compatible values and expires them after ``ttl``
+seconds, and counts hits and misses for the metrics endpoint.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class NullCache:
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key):
+        self.stats.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class LocalRedis:
+    """In-process stand-in for the few redis-py calls RedisCache makes."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key, value, ex=None):
+        expires = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._data[key] = (expires, value.encode("utf-8"))
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match=None):
+        prefix = match.rstrip("*") if match else ""
+        with self._lock:
+            keys = [key for key in self._data if key.startswith(prefix)]
+        return iter(keys)
+
+    def dbsize(self):
+        return len(self._data)
+
+
+class RedisCache:
+    def __init__(self, client, ttl=60, prefix="cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def delete_prefix(self, prefix):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self):
+        self.delete_prefix("")
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}*"))
+
+
+def create_cache(url, maxsize=1024, ttl=60, prefix="cache:"):
+    if url.startswith("memory://"):
+        return LRUCache(maxsize=maxsize, ttl=ttl)
+    if url.startswith("null://"):
+        return NullCache()
+    if url.startswith("local://"):
+        return RedisCache(LocalRedis(), ttl=ttl, prefix=prefix)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(
+                f"Cache URL {url!r} needs the 'redis' package to be installed."
+            )
+        return RedisCache(redis.Redis.from_url(url), ttl=ttl, prefix=prefix)
+    raise ValueError(f"Unsupported cache URL: {url!r}")
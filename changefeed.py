@@ -0,0 +1,299 @@
+"""Append-only change log of events, streamed as server-sent events.
+
+Every flush that inserts, updates or deletes an event, task, resource,
+budget, expense or participant appends one ChangeLog entry per row, on the
+flush's own connection: the entry commits or rolls back with the write.
+An entry holds the row, read back as stored, as the event-detail endpoint
+serializes it (null for deletes) and, for updates, the columns that
+changed; updates touching none of the serialized columns are not logged.
+Writes that bypass the ORM unit of work must call ``record_bulk_changes``
+(and ``mark_changes_logged``) themselves.
+
+``ChangeFeed.stream`` turns the log of one event into an SSE stream. Entry
+ids only grow, so they are the SSE ids: a reconnecting client sends the
+last one it saw as Last-Event-ID and the stream resumes right after it. A
+client resuming from an entry that has been pruned gets a "reset" event
+and should reload the event. Each poll is one range scan of the
+(event_id, id) index on a short-lived connection. Commits in this process
+wake the streams at once; commits elsewhere are seen within the poll
+interval. A stream ends after CHANGE_STREAM_MAX_SECONDS, or once the event
+is deleted; EventSource clients reconnect and resume on their own.
+
+An open stream holds a request thread for its whole lifetime, so serve it
+from threaded workers (``gunicorn -k gthread --threads 8``, or the WSGI
+thread pool of asgi.py): a sync worker streaming to one client serves
+nothing else. Each process holds at most CHANGE_STREAM_MAX_CONCURRENT
+streams, fewer than its threads, so other requests always find one; past
+that ``acquire_slot`` raises ``ChangeStreamsFull`` and the API answers 503.
+
+Configuration (read in ``init_app``):
+
+    CHANGE_STREAM_POLL_INTERVAL  seconds between polls (default 1)
+    CHANGE_STREAM_HEARTBEAT      seconds between keep-alive comments (default 15)
+    CHANGE_STREAM_MAX_SECONDS    lifetime of one stream (default 300)
+    CHANGE_STREAM_BATCH_SIZE     entries read per poll (default 100)
+    CHANGE_STREAM_MAX_CONCURRENT open streams per process (default 4)
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event as sa_event, func, insert, inspect, select
+
+from models import db, utcnow
+from models import Event, Task, EventResource, Budget, Expense, Participant, ChangeLog
+from serializers import (
+    event_row_serializer,
+    task_row_serializer,
+    resource_row_serializer,
+    budget_row_serializer,
+    expense_row_serializer,
+    participant_row_serializer,
+)
+
+ENTITIES = {
+    Event: ("event", event_row_serializer),
+    Task: ("task", task_row_serializer),
+    EventResource: ("resource", resource_row_serializer),
+    Budget: ("budget", budget_row_serializer),
+    Expense: ("expense", expense_row_serializer),
+    Participant: ("participant", participant_row_serializer),
+}
+
+# Bumped by every commit that logged changes; streams wait for it to move
+_generation = 0
+_changed = threading.Condition()
+
+
+class ChangeStreamsFull(Exception):
+    """Raised when CHANGE_STREAM_MAX_CONCURRENT streams are already open."""
+
+
+def _entry(model, op, event_id, row_id, row=None, fields=None):
+    entity, serializer = ENTITIES[model]
+    return {
+        "event_id": event_id,
+        "entity": entity,
+        "entity_id": row_id,
+        "op": op,
+        "fields": json.dumps(fields) if fields is not None else None,
+        "data": json.dumps(serializer(row)) if row is not None else None,
+        "created_at": utcnow(),
+    }
+
+
+def record_changes(connection, entries):
+    if entries:
+        connection.execute(insert(ChangeLog.__table__), entries)
+
+
+def record_bulk_changes(connection, model, event_id, op, ids, fields=None):
+    """Log rows of ``event_id`` that a bulk statement inserted, updated or
+    deleted; inserted and updated rows are read back from ``connection``.
+    ``fields`` maps the id of an updated row to the columns it set."""
+    if not ids:
+        return
+    if op == "delete":
+        entries = [_entry(model, op, event_id, row_id) for row_id in ids]
+    else:
+        rows = connection.execute(
+            select(model.__table__)
+            .where(model.__table__.c.id.in_(ids))
+            .order_by(model.__table__.c.id)
+        )
+        entries = [
+            _entry(model, op, event_id, row.id, row, (fields or {}).get(row.id))
+            for row in rows
+        ]
+    record_changes(connection, entries)
+
+
+def _instance_changes(instance, op):
+    """The (model, op, event_id, row_id, fields) changes a flush of
+    ``instance`` logs."""
+    model = type(instance)
+    serializer = ENTITIES[model][1]
+    state = inspect(instance)
+    event_id = instance.id if model is Event else instance.event_id
+    if op == "delete":
+        return [(model, op, event_id, instance.id, None)]
+    fields = None
+    changes = []
+    if op == "update":
+        fields = [
+            key
+            for key in serializer.fields
+            if key in state.attrs and state.attrs[key].history.has_changes()
+        ]
+        if not fields:
+            return []
+        if model is not Event and "event_id" in fields:
+            # Moved to another event: it is gone from the old one's feed
+            changes.extend(
+                (model, "delete", old, instance.id, None)
+                for old in state.attrs.event_id.history.deleted
+                if old is not None
+            )
+    if event_id is not None:
+        changes.append((model, op, event_id, instance.id, fields))
+    return changes
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def _log_changes_after_flush(session, flush_context):
+    changes = []
+    for op, instances in (
+        ("insert", session.new),
+        ("update", session.dirty),
+        ("delete", session.deleted),
+    ):
+        for instance in instances:
+            if type(instance) in ENTITIES:
+                changes.extend(_instance_changes(instance, op))
+    if not changes:
+        return
+    connection = session.connection()
+    # Serialize the rows as stored, not the instances: values are only
+    # coerced through the column types on the way back (an amount of 5 is
+    # read back as 5.00, as the event-detail endpoint returns it)
+    written = {}
+    for model, op, _, row_id, _ in changes:
+        if op != "delete":
+            written.setdefault(model, set()).add(row_id)
+    rows = {}
+    for model, ids in written.items():
+        table = model.__table__
+        rows[model] = {
+            row.id: row
+            for row in connection.execute(select(table).where(table.c.id.in_(ids)))
+        }
+    record_changes(
+        connection,
+        [
+            _entry(model, op, event_id, row_id, rows.get(model, {}).get(row_id), fields)
+            for model, op, event_id, row_id, fields in changes
+        ],
+    )
+    mark_changes_logged(session)
+
+
+def mark_changes_logged(session):
+    """Wake the streams of this process once ``session`` commits."""
+    session.info["changes_logged"] = True
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def _notify_streams(session):
+    if session.info.pop("changes_logged", False):
+        notify_streams()
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def _discard_notification(session):
+    session.info.pop("changes_logged", None)
+
+
+def notify_streams():
+    global _generation
+    with _changed:
+        _generation += 1
+        _changed.notify_all()
+
+
+def _wait_for_change(generation, timeout):
+    with _changed:
+        _changed.wait_for(lambda: _generation != generation, timeout)
+
+
+def format_event(entry):
+    payload = {
+        "entity": entry.entity,
+        "id": entry.entity_id,
+        "op": entry.op,
+        "fields": json.loads(entry.fields) if entry.fields else None,
+        "data": json.loads(entry.data) if entry.data else None,
+    }
+    return f"id: {entry.id}\nevent: {entry.entity}\ndata: {json.dumps(payload)}\n\n"
+
+
+class ChangeFeed:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.poll_interval = app.config.get("CHANGE_STREAM_POLL_INTERVAL", 1.0)
+        self.heartbeat = app.config.get("CHANGE_STREAM_HEARTBEAT", 15.0)
+        self.max_seconds = app.config.get("CHANGE_STREAM_MAX_SECONDS", 300.0)
+        self.batch_size = app.config.get("CHANGE_STREAM_BATCH_SIZE", 100)
+        self.max_concurrent = app.config.get("CHANGE_STREAM_MAX_CONCURRENT", 4)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+
+    def acquire_slot(self):
+        """Reserve a stream; call ``release_slot`` once its response closes."""
+        if not self._slots.acquire(blocking=False):
+            raise ChangeStreamsFull()
+
+    def release_slot(self):
+        self._slots.release()
+
+    def _start_after(self, connection, last_id):
+        """The id to stream after, and whether the client must reload."""
+        latest = connection.execute(select(func.max(ChangeLog.id))).scalar() or 0
+        if last_id is None:
+            return latest, False
+        oldest = connection.execute(select(func.min(ChangeLog.id))).scalar()
+        if last_id > latest or (oldest is not None and last_id < oldest - 1):
+            # Pruned, or an id this log never issued
+            return latest, True
+        return last_id, False
+
+    def stream(self, engine, event_id, last_id=None):
+        """Yield the SSE messages of ``event_id``'s changes after ``last_id``
+        (from now on when None)."""
+        with engine.connect() as connection:
+            last_id, reset = self._start_after(connection, last_id)
+        yield f"retry: {int(self.poll_interval * 1000)}\n\n"
+        if reset:
+            yield f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"
+
+        started = idle_since = time.monotonic()
+        while time.monotonic() - started < self.max_seconds:
+            generation = _generation
+            with engine.connect() as connection:
+                entries = connection.execute(
+                    select(ChangeLog.__table__)
+                    .where(ChangeLog.event_id == event_id, ChangeLog.id > last_id)
+                    .order_by(ChangeLog.id)
+                    .limit(self.batch_size)
+                ).all()
+            for entry in entries:
+                yield format_event(entry)
+                last_id = entry.id
+                if entry.entity == "event" and entry.op == "delete":
+                    return
+            if entries:
+                idle_since = time.monotonic()
+                continue
+            if time.monotonic() - idle_since >= self.heartbeat:
+                yield ": keep-alive\n\n"
+                idle_since = time.monotonic()
+            _wait_for_change(generation, self.poll_interval)
+
+
+changes_cli = AppGroup("changes", help="Maintain the change log.")
+
+
+@changes_cli.command("prune")
+@click.option("--days", type=float, default=7, show_default=True)
+def prune_command(days):
+    """Delete change log entries older than --days."""
+    cutoff = utcnow() - timedelta(days=days)
+    with db.engine.begin() as connection:
+        deleted = connection.execute(
+            ChangeLog.__table__.delete().where(ChangeLog.created_at < cutoff)
+        ).rowcount
+    click.echo(f"Pruned {deleted} change log entries.")
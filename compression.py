@@ -0,0 +1,206 @@
+"""Content-negotiated response compression.
+
+``ResponseCompression(app)`` compresses JSON and NDJSON responses with the
+best encoding the client accepts:
+
+    zstd   needs the 'zstandard' package
+    br     needs the 'brotli' package
+    gzip   always available
+
+The client's q-values decide; ties go to the server's preference order.
+Responses smaller than the threshold are sent as they are, since the
+compressed framing would cost more than it saves. Streamed responses (the
+NDJSON export) are compressed incrementally as the generator yields, so
+they are never buffered whole. ETags are left alone: they are all weak, and
+a weak validator may cover every encoding.
+
+Configuration (read in ``init_app``):
+
+    COMPRESS_ENABLED      compress responses (default on)
+    COMPRESS_ALGORITHMS   server preference (default the installed ones of
+                          "zstd,br,gzip")
+    COMPRESS_MIN_SIZE     smallest body compressed, in bytes (default 1024)
+    COMPRESS_LEVEL        level for every algorithm, or per algorithm with
+                          COMPRESS_GZIP_LEVEL (default 6), COMPRESS_BR_LEVEL
+                          (default 4) and COMPRESS_ZSTD_LEVEL (default 3)
+"""
+import zlib
+
+from flask import request
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson"}
+
+
+class _GzipCodec:
+    name = "gzip"
+    default_level = 6
+
+    def compressor(self, level):
+        # wbits=31 writes the gzip container rather than a raw zlib stream
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+class _BrotliCompressor:
+    def __init__(self, brotli, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class _BrotliCodec:
+    name = "br"
+    default_level = 4
+
+    def __init__(self):
+        import brotli
+
+        self._brotli = brotli
+
+    def compressor(self, level):
+        return _BrotliCompressor(self._brotli, level)
+
+
+class _ZstdCodec:
+    name = "zstd"
+    default_level = 3
+
+    def __init__(self):
+        import zstandard
+
+        self._zstandard = zstandard
+
+    def compressor(self, level):
+        return self._zstandard.ZstdCompressor(level=level).compressobj()
+
+
+CODECS = {"zstd": _ZstdCodec, "br": _BrotliCodec, "gzip": _GzipCodec}
+PACKAGES = {"zstd": "zstandard", "br": "brotli", "gzip": None}
+
+
+def available_algorithms():
+    names = []
+    for name, codec in CODECS.items():
+        try:
+            codec()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def load_codecs(names):
+    codecs = []
+    for name in names:
+        if name not in CODECS:
+            raise RuntimeError(
+                f"Unknown compression algorithm {name!r}; "
+                f"expected some of {sorted(CODECS)}."
+            )
+        try:
+            codecs.append(CODECS[name]())
+        except ImportError:
+            raise RuntimeError(
+                f"Compression algorithm {name!r} needs the "
+                f"{PACKAGES[name]!r} package to be installed."
+            )
+    return codecs
+
+
+def negotiate(accept_encoding, codecs):
+    """Return the codec to use for an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding, Accept)
+    best = None
+    best_quality = 0
+    for codec in codecs:
+        quality = accept.quality(codec.name)
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def compress(codec, level, data):
+    compressor = codec.compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(codec, level, chunks):
+    compressor = codec.compressor(level)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    finally:
+        # Lets stream_with_context pop its context if the client goes away
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+class ResponseCompression:
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESS_ENABLED", True)
+        self.codecs = []
+        if not self.enabled:
+            return
+        names = app.config.get("COMPRESS_ALGORITHMS") or available_algorithms()
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(",") if name.strip()]
+        self.codecs = load_codecs(names)
+        self.min_size = app.config.get("COMPRESS_MIN_SIZE", 1024)
+        level = app.config.get("COMPRESS_LEVEL")
+        self.levels = {
+            codec.name: app.config.get(
+                f"COMPRESS_{codec.name.upper()}_LEVEL",
+                codec.default_level if level is None else level,
+            )
+            for codec in self.codecs
+        }
+        app.after_request(self._after_request)
+
+    def choose(self, accept_encoding):
+        """Return (codec, level) for an Accept-Encoding header, or None."""
+        codec = negotiate(accept_encoding, self.codecs)
+        if codec is None:
+            return None
+        return codec, self.levels[codec.name]
+
+    def _after_request(self, response):
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        choice = self.choose(request.headers.get("Accept-Encoding"))
+        if choice is None or request.method == "HEAD":
+            return response
+        codec, level = choice
+
+        if response.is_streamed:
+            response.response = compress_stream(codec, level, response.response)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compress(codec, level, data))
+        response.headers["Content-Encoding"] = codec.name
+        return response
@@ -0,0 +1,91 @@
+"""Database engine configuration.
+
+``configure_database(app)`` must run before ``db.init_app(app)``. It points
+the app at ``DATABASE_URL`` (SQLite ``app.db`` when unset) and sizes the
+connection pool. ``register_sqlite_pragmas(engine, app.config)`` then
+tunes every new SQLite connection:
+
+    journal_mode=WAL     readers no longer block on, or block, the writer
+    synchronous=NORMAL   fsync at checkpoints rather than every commit
+                         (still durable against application crashes)
+    mmap_size            read pages through a memory map
+    cache_size           per-connection page cache (negative = KiB)
+    busy_timeout         wait for the write lock instead of failing
+
+Every value can be overridden through the environment variable of the same
+name as its config key. PostgreSQL URLs need a driver installed, e.g.
+``postgresql+psycopg2://...`` with psycopg2.
+"""
+import os
+
+from sqlalchemy import event as sa_event
+
+DEFAULTS = {
+    "SQLITE_JOURNAL_MODE": "WAL",
+    "SQLITE_SYNCHRONOUS": "NORMAL",
+    "SQLITE_MMAP_SIZE": 256 * 1024 * 1024,
+    "SQLITE_CACHE_SIZE": -64000,
+    "SQLITE_BUSY_TIMEOUT": 5000,
+    "DB_POOL_SIZE": 10,
+    "DB_MAX_OVERFLOW": 10,
+    "DB_POOL_TIMEOUT": 30,
+    "DB_POOL_RECYCLE": 1800,
+}
+
+
+def database_uri():
+    uri = os.environ.get("DATABASE_URL", "sqlite:///app.db")
+    # Some hosting providers still hand out the pre-1.4 scheme name
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://") :]
+    return uri
+
+
+def _setting(key):
+    default = DEFAULTS[key]
+    value = os.environ.get(key)
+    if value is None:
+        return default
+    return type(default)(value)
+
+
+def configure_database(app):
+    for key in DEFAULTS:
+        app.config.setdefault(key, _setting(key))
+    uri = app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_uri())
+
+    options = {}
+    if uri.startswith("sqlite"):
+        if uri not in ("sqlite://", "sqlite:///:memory:"):
+            # Connections are shared across threads by the pool
+            options["connect_args"] = {"check_same_thread": False}
+            options["pool_size"] = app.config["DB_POOL_SIZE"]
+            options["max_overflow"] = app.config["DB_MAX_OVERFLOW"]
+            options["pool_timeout"] = app.config["DB_POOL_TIMEOUT"]
+    else:
+        options["pool_size"] = app.config["DB_POOL_SIZE"]
+        options["max_overflow"] = app.config["DB_MAX_OVERFLOW"]
+        options["pool_timeout"] = app.config["DB_POOL_TIMEOUT"]
+        options["pool_recycle"] = app.config["DB_POOL_RECYCLE"]
+        options["pool_pre_ping"] = True
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", options)
+
+
+def register_sqlite_pragmas(engine, config):
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = (
+        ("journal_mode", config["SQLITE_JOURNAL_MODE"]),
+        ("synchronous", config["SQLITE_SYNCHRONOUS"]),
+        ("mmap_size", int(config["SQLITE_MMAP_SIZE"])),
+        ("cache_size", int(config["SQLITE_CACHE_SIZE"])),
+        ("busy_timeout", int(config["SQLITE_BUSY_TIMEOUT"])),
+    )
+
+    @sa_event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -0,0 +1,185 @@
+"""Due and overdue tasks, and the reminder scheduler.
+
+Open tasks are read through the (status, deadline, id) index without ever
+touching completed ones. The distinct statuses are found with one index
+seek each; every status other than Completed is then a range scan over its
+deadlines, and the per-status scans are merged in (deadline, id) order. A
+page of ``limit`` tasks therefore reads at most ``limit`` index entries per
+open status, however many tasks the table holds.
+
+``ReminderScheduler`` turns those scans into reminder batches, one per
+assignee per page. Each tick covers the deadlines between the previous
+tick's horizons and now: tasks coming due within REMINDER_LEAD_HOURS are
+sent as "due_soon" and tasks whose deadline just passed as "overdue", so
+each task is reminded once of each. The horizons live in memory: a new
+process starts from now, and a deadline moved into a window that was
+already covered is not reminded. It runs as its own process,
+``flask reminders run``, and only one may run at a time: app workers never
+start it, since every forked worker would send the same reminders again.
+
+Configuration (read in ``init_app``):
+
+    REMINDER_INTERVAL      seconds between ticks (default 60)
+    REMINDER_LEAD_HOURS    how long before a deadline to remind (default 24)
+    REMINDER_BATCH_SIZE    tasks read per query (default 500)
+"""
+import heapq
+import logging
+import threading
+from datetime import timedelta
+from itertools import islice
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import and_, func, or_, select
+
+from models import db, Task, utcnow
+from serializers import task_serializer
+from task_graph import COMPLETED
+
+
+def open_statuses(connection):
+    """Every status in use except Completed, NULL included, via index seeks."""
+    statuses = []
+    untracked = select(Task.id).where(Task.status.is_(None)).limit(1)
+    if connection.execute(untracked).first():
+        statuses.append(None)
+    # A loose index scan: each MIN() jumps to the next distinct status
+    status = connection.execute(select(func.min(Task.status))).scalar()
+    while status is not None:
+        if status != COMPLETED:
+            statuses.append(status)
+        status = connection.execute(
+            select(func.min(Task.status)).where(Task.status > status)
+        ).scalar()
+    return statuses
+
+
+def due_tasks(connection, end, start=None, limit=100, after=None):
+    """Open tasks with ``start <= deadline < end``, in (deadline, id) order.
+
+    ``after`` is the (deadline, id) of the last task of the previous page.
+    """
+    scans = []
+    for status in open_statuses(connection):
+        query = select(Task.__table__).where(
+            Task.status.is_(None) if status is None else Task.status == status,
+            Task.deadline < end,
+        )
+        if start is not None:
+            query = query.where(Task.deadline >= start)
+        else:
+            query = query.where(Task.deadline.isnot(None))
+        if after is not None:
+            deadline, task_id = after
+            query = query.where(
+                or_(
+                    Task.deadline > deadline,
+                    and_(Task.deadline == deadline, Task.id > task_id),
+                )
+            )
+        query = query.order_by(Task.deadline, Task.id).limit(limit)
+        scans.append(connection.execute(query).all())
+    merged = heapq.merge(*scans, key=lambda row: (row.deadline, row.id))
+    return list(islice(merged, limit))
+
+
+def reminder_payload(row):
+    return dict(task_serializer(row), event_id=row.event_id)
+
+
+class ReminderScheduler:
+    def __init__(self, app=None, sender=None):
+        # sender(batch) gets {"kind", "user_id", "tasks"}; the default logs it
+        self.sender = sender or self._log_batch
+        self.due_soon_until = None
+        self.overdue_until = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.get("REMINDER_INTERVAL", 60)
+        self.lead = timedelta(hours=app.config.get("REMINDER_LEAD_HOURS", 24))
+        self.batch_size = app.config.get("REMINDER_BATCH_SIZE", 500)
+        app.extensions["reminders"] = self
+
+    def _log_batch(self, batch):
+        self.app.logger.info(
+            "Reminder (%s) for user %s: tasks %s",
+            batch["kind"],
+            batch["user_id"],
+            ", ".join(str(task["id"]) for task in batch["tasks"]),
+        )
+
+    def _send_range(self, connection, kind, start, end):
+        sent = 0
+        after = None
+        while True:
+            rows = due_tasks(connection, end, start, self.batch_size, after)
+            if not rows:
+                return sent
+            batches = {}
+            for row in rows:
+                batches.setdefault(row.assigned_to, []).append(reminder_payload(row))
+            for user_id, tasks in batches.items():
+                self.sender({"kind": kind, "user_id": user_id, "tasks": tasks})
+            sent += len(rows)
+            after = (rows[-1].deadline, rows[-1].id)
+
+    def tick(self, now=None):
+        """Send the reminders that came up since the last tick.
+
+        Returns the number of (due_soon, overdue) tasks sent. The horizons
+        only advance once every batch has been handed to the sender.
+        """
+        now = now or utcnow()
+        due_soon_until = now + self.lead
+        with db.engine.connect() as connection:
+            due_soon = self._send_range(
+                connection,
+                "due_soon",
+                self.due_soon_until or now,
+                due_soon_until,
+            )
+            overdue = self._send_range(
+                connection, "overdue", self.overdue_until or now, now
+            )
+        self.due_soon_until, self.overdue_until = due_soon_until, now
+        return due_soon, overdue
+
+    def run(self, interval=None):
+        """Tick every ``interval`` seconds until ``stop`` is called."""
+        interval = interval or self.interval
+        with self.app.app_context():
+            while True:
+                try:
+                    self.tick()
+                except Exception:
+                    self.app.logger.exception("Reminder tick failed")
+                if self._stop.wait(interval):
+                    return
+
+    def stop(self):
+        self._stop.set()
+
+
+reminders_cli = AppGroup("reminders", help="Send task deadline reminders.")
+
+
+@reminders_cli.command("run")
+@click.option("--interval", type=float, help="Seconds between ticks.")
+def run_command(interval):
+    """Run the reminder scheduler in the foreground."""
+    scheduler = current_app.extensions["reminders"]
+    interval = interval or scheduler.interval
+    if not current_app.logger.level:
+        # Show the default sender's batches
+        current_app.logger.setLevel(logging.INFO)
+    click.echo(f"Sending reminders every {interval:g}s; Ctrl+C to stop.")
+    try:
+        scheduler.run(interval)
+    except KeyboardInterrupt:
+        scheduler.stop()
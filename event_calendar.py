@@ -0,0 +1,89 @@
+"""Calendar views over event start times.
+
+Events store their day in ``Event.date`` and, optionally, the time of day
+in ``Event.time``. ``Event.starts_at`` combines the two into one timestamp,
+set on every ORM insert and update, so a date range is a single scan of the
+``(starts_at, id)`` index. Writes that bypass the ORM must fill it with
+``event_start`` themselves.
+
+Buckets are keyed by the ISO date they begin on: the day itself, the Monday
+of an ISO week, or the first of the month. Only buckets holding events are
+returned.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event as sa_event, func, select
+
+from models import Event
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def event_start(date, time):
+    """The start timestamp of an event dated ``date`` at ``time``."""
+    if date is None:
+        return None
+    if time is not None:
+        day = date.date() if isinstance(date, datetime) else date
+        return datetime.combine(day, time)
+    if isinstance(date, datetime):
+        return date
+    return datetime.combine(date, datetime.min.time())
+
+
+@sa_event.listens_for(Event, "before_insert")
+@sa_event.listens_for(Event, "before_update")
+def _set_starts_at(mapper, connection, target):
+    target.starts_at = event_start(target.date, target.time)
+
+
+def bucket_start(starts_at, granularity):
+    day = starts_at.date()
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _bucket_expression(dialect, granularity):
+    """SQL computing ``bucket_start(Event.starts_at)`` as an ISO date."""
+    if dialect == "sqlite":
+        modifiers = {
+            "day": (),
+            # The next Sunday (or this one), then back to its Monday
+            "week": ("weekday 0", "-6 days"),
+            "month": ("start of month",),
+        }[granularity]
+        return func.date(Event.starts_at, *modifiers)
+    return func.to_char(func.date_trunc(granularity, Event.starts_at), "YYYY-MM-DD")
+
+
+def _in_range(query, start, end):
+    return query.where(Event.starts_at >= start, Event.starts_at < end)
+
+
+def count_buckets(session, start, end, granularity):
+    """[(bucket, count)] of the events starting in [start, end)."""
+    dialect = session.get_bind().dialect.name
+    bucket = _bucket_expression(dialect, granularity).label("bucket")
+    rows = session.execute(
+        _in_range(select(bucket, func.count()), start, end)
+        .group_by(bucket)
+        .order_by(bucket)
+    ).all()
+    return [(value, count) for value, count in rows]
+
+
+def event_buckets(session, start, end, granularity):
+    """[(bucket, [events])] of the events starting in [start, end), in order."""
+    events = session.execute(
+        _in_range(select(Event), start, end).order_by(Event.starts_at, Event.id)
+    ).scalars()
+    buckets = []
+    for event in events:
+        key = bucket_start(event.starts_at, granularity).isoformat()
+        if not buckets or buckets[-1][0] != key:
+            buckets.append((key, []))
+        buckets[-1][1].append(event)
+    return buckets
@@ -0,0 +1,199 @@
+"""Maintenance of the EventStats rollup table.
+
+Whenever a flush touches a Task, Expense, Budget or Participant, the stats
+row of every affected event is recomputed from indexed aggregates in the
+same transaction, so reads become a primary-key lookup. Writes that bypass
+the ORM unit of work (bulk_insert_mappings, Query.update) must call
+``refresh_event_stats`` themselves.
+"""
+import sys
+from decimal import Decimal
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import case, event as sa_event, func, inspect, select
+
+from models import db, Event, Task, Budget, Expense, Participant, EventStats
+from models import EventResource, TaskDependency
+
+STATS_COLUMNS = (
+    "total_tasks",
+    "completed_tasks",
+    "participant_count",
+    "budget_id",
+    "allocated_budget",
+    "total_spent_amount",
+)
+
+
+def _restrict(statement, column, event_ids):
+    return statement if event_ids is None else statement.where(column.in_(event_ids))
+
+
+def compute_event_stats(connection, event_ids=None):
+    """Aggregate stats rows for ``event_ids`` (all events when None)."""
+    stats = {
+        event_id: {
+            "event_id": event_id,
+            "total_tasks": 0,
+            "completed_tasks": 0,
+            "participant_count": 0,
+            "budget_id": None,
+            "allocated_budget": None,
+            "total_spent_amount": Decimal("0"),
+        }
+        for event_id in connection.execute(
+            _restrict(select(Event.id), Event.id, event_ids)
+        ).scalars()
+    }
+    if not stats:
+        return stats
+
+    task_rows = connection.execute(
+        _restrict(
+            select(
+                Task.event_id,
+                func.count(Task.id),
+                func.sum(case((Task.status == "Completed", 1), else_=0)),
+            ),
+            Task.event_id,
+            event_ids,
+        ).group_by(Task.event_id)
+    )
+    for event_id, total, completed in task_rows:
+        if event_id in stats:
+            stats[event_id]["total_tasks"] = total
+            stats[event_id]["completed_tasks"] = completed or 0
+
+    participant_rows = connection.execute(
+        _restrict(
+            select(Participant.event_id, func.count(Participant.id)),
+            Participant.event_id,
+            event_ids,
+        ).group_by(Participant.event_id)
+    )
+    for event_id, count in participant_rows:
+        if event_id in stats:
+            stats[event_id]["participant_count"] = count
+
+    first_budget_ids = _restrict(
+        select(func.min(Budget.id)), Budget.event_id, event_ids
+    ).group_by(Budget.event_id)
+    budget_rows = connection.execute(
+        select(
+            Budget.event_id,
+            Budget.id,
+            Budget.allocated_budget,
+            func.coalesce(func.sum(Expense.amount), 0),
+        )
+        .outerjoin(Expense, Expense.budget_id == Budget.id)
+        .where(Budget.id.in_(first_budget_ids))
+        .group_by(Budget.id)
+    )
+    for event_id, budget_id, allocated, spent in budget_rows:
+        if event_id in stats:
+            stats[event_id]["budget_id"] = budget_id
+            stats[event_id]["allocated_budget"] = allocated
+            stats[event_id]["total_spent_amount"] = spent
+
+    return stats
+
+
+def refresh_event_stats(connection, event_ids):
+    """Recompute and replace the stats rows of ``event_ids``."""
+    event_ids = {event_id for event_id in event_ids if event_id is not None}
+    if not event_ids:
+        return
+    table = EventStats.__table__
+    connection.execute(table.delete().where(table.c.event_id.in_(event_ids)))
+    rows = list(compute_event_stats(connection, event_ids).values())
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+def _attribute_values(instance, key):
+    history = inspect(instance).attrs[key].history
+    return [value for value in history.sum() if value is not None]
+
+
+def changed_child_event_ids(session):
+    """Return the ids of events whose child rows the pending flush touched.
+
+    Both the old and new value of a changed event_id count, and expenses
+    also count toward the event owning their budget.
+    """
+    event_ids = set()
+    budget_ids = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(
+            instance,
+            (Task, TaskDependency, EventResource, Expense, Budget, Participant),
+        ):
+            event_ids.update(_attribute_values(instance, "event_id"))
+        if isinstance(instance, Expense):
+            budget_ids.update(_attribute_values(instance, "budget_id"))
+    if budget_ids:
+        event_ids.update(
+            session.connection()
+            .execute(select(Budget.event_id).where(Budget.id.in_(budget_ids)))
+            .scalars()
+        )
+    event_ids.discard(None)
+    return event_ids
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def _refresh_stats_after_flush(session, flush_context):
+    event_ids = changed_child_event_ids(session)
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, Event):
+            # New events get a zeroed row; deleted events lose theirs
+            event_ids.add(instance.id)
+    if event_ids:
+        refresh_event_stats(session.connection(), event_ids)
+
+
+event_stats_cli = AppGroup("event-stats", help="Maintain the EventStats rollup.")
+
+
+@event_stats_cli.command("rebuild")
+def rebuild_command():
+    """Recompute every EventStats row from the raw tables."""
+    with db.engine.begin() as connection:
+        connection.execute(EventStats.__table__.delete())
+        rows = list(compute_event_stats(connection).values())
+        if rows:
+            connection.execute(EventStats.__table__.insert(), rows)
+    click.echo(f"Rebuilt stats for {len(rows)} events.")
+
+
+@event_stats_cli.command("verify")
+def verify_command():
+    """Compare stored EventStats rows with freshly computed aggregates."""
+    with db.engine.connect() as connection:
+        expected = compute_event_stats(connection)
+        stored = {
+            row.event_id: row._asdict()
+            for row in connection.execute(select(EventStats.__table__))
+        }
+
+    mismatches = 0
+    for event_id in sorted(expected.keys() | stored.keys()):
+        want = expected.get(event_id)
+        have = stored.get(event_id)
+        if want is None or have is None:
+            mismatches += 1
+            click.echo(f"event {event_id}: {'missing' if have is None else 'orphaned'}")
+            continue
+        for column in STATS_COLUMNS:
+            if want[column] != have[column]:
+                mismatches += 1
+                click.echo(
+                    f"event {event_id}: {column} stored={have[column]} "
+                    f"expected={want[column]}"
+                )
+
+    if mismatches:
+        click.echo(f"{mismatches} mismatches; run `flask event-stats rebuild`.")
+        sys.exit(1)
+    click.echo(f"Stats for {len(expected)} events are consistent.")
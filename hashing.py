@@ -0,0 +1,111 @@
+"""Password hashing on a bounded process pool.
+
+bcrypt is deliberately slow, so hashing on the request thread lets a burst
+of logins pin every worker. ``PasswordHasher`` runs the work in a process
+pool and caps how many hashes may be queued; callers past the cap get
+``HashingPoolSaturated`` immediately so the API can answer 429 instead of
+piling up requests.
+
+The pool and the cap belong to one web worker process. By default each
+worker gets its share of the CPUs, CPUs / WEB_CONCURRENCY (the worker count
+gunicorn also reads), so the whole deployment runs at most one hash per
+CPU. The request still waits for its hash, so the cap only fills when a
+worker serves several requests at once: run gunicorn with threaded workers,
+e.g. ``gunicorn -w $WEB_CONCURRENCY -k gthread --threads 8 app:app``. A sync
+worker hashes one request at a time and never answers 429.
+
+Configuration (read in ``init_app``):
+
+    BCRYPT_LOG_ROUNDS       bcrypt work factor for new hashes (default 12)
+    HASH_POOL_WORKERS       worker processes; 0 hashes inline
+                            (default CPUs / WEB_CONCURRENCY)
+    HASH_POOL_MAX_PENDING   hashes queued or running at once (default 4x workers)
+    HASH_POOL_TIMEOUT       seconds to wait for a free slot (default 0.05)
+"""
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when no hashing slot frees up within HASH_POOL_TIMEOUT."""
+
+
+def _hash_password(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds, prefix=b"2b")
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _check_password(pw_hash, password):
+    pw_hash = pw_hash.encode("utf-8")
+    candidate = bcrypt.hashpw(password.encode("utf-8"), pw_hash)
+    return hmac.compare_digest(candidate, pw_hash)
+
+
+def default_pool_workers():
+    """This web worker's share of the CPUs, at least one process."""
+    web_workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    return max((os.cpu_count() or 1) // max(web_workers, 1), 1)
+
+
+def hash_rounds(pw_hash):
+    """Return the cost factor encoded in a ``$2b$12$...`` hash."""
+    try:
+        return int(pw_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        self.workers = app.config.get("HASH_POOL_WORKERS", default_pool_workers())
+        self.max_pending = app.config.get(
+            "HASH_POOL_MAX_PENDING", max(self.workers, 1) * 4
+        )
+        self.timeout = app.config.get("HASH_POOL_TIMEOUT", 0.05)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _get_executor(self):
+        # Created lazily and per process, so gunicorn's pre-fork workers each
+        # get their own pool instead of sharing one inherited across fork().
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingPoolSaturated()
+        try:
+            if self.workers == 0:
+                return func(*args)
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash_password(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def check_password(self, pw_hash, password):
+        return self._run(_check_password, pw_hash, password)
+
+    def needs_rehash(self, pw_hash):
+        return hash_rounds(pw_hash) != self.rounds
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
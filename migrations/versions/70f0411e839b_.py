@@ -0,0 +1,89 @@
+"""full-text search tables
+
+Revision ID: 70f0411e839b
+Revises: dafd5395da61
+Create Date: 2026-10-18 21:04:59.174162
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '70f0411e839b'
+down_revision = 'dafd5395da61'
+branch_labels = None
+depends_on = None
+
+
+# External-content FTS5 indexes and the triggers keeping them in sync, as
+# created by search.create_search_index. SQLite only.
+UPGRADE = [
+    """CREATE VIRTUAL TABLE event_fts USING fts5(
+        title, description, location,
+        content='event', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER event_fts_ai AFTER INSERT ON event BEGIN
+        INSERT INTO event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER event_fts_ad AFTER DELETE ON event BEGIN
+        INSERT INTO event_fts(event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER event_fts_au AFTER UPDATE OF title, description, location
+    ON event BEGIN
+        INSERT INTO event_fts(event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    "INSERT INTO event_fts(event_fts) VALUES ('rebuild')",
+    """CREATE VIRTUAL TABLE task_fts USING fts5(
+        title, description,
+        content='task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description
+    ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+]
+
+DOWNGRADE = [
+    "DROP TRIGGER task_fts_au",
+    "DROP TRIGGER task_fts_ad",
+    "DROP TRIGGER task_fts_ai",
+    "DROP TABLE task_fts",
+    "DROP TRIGGER event_fts_au",
+    "DROP TRIGGER event_fts_ad",
+    "DROP TRIGGER event_fts_ai",
+    "DROP TABLE event_fts",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in UPGRADE:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,106 @@
+"""empty message
+
+Revision ID: 9b89f02c6ace
+Revises: 72c2b8cd154f
+Create Date: 2026-10-18 20:31:04.519265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b89f02c6ace'
+down_revision = '72c2b8cd154f'
+branch_labels = None
+depends_on = None
+
+event = sa.table('event', sa.column('id', sa.Integer))
+task = sa.table(
+    'task',
+    sa.column('id', sa.Integer),
+    sa.column('event_id', sa.Integer),
+    sa.column('status', sa.String),
+)
+participant = sa.table(
+    'participant', sa.column('id', sa.Integer), sa.column('event_id', sa.Integer)
+)
+budget = sa.table(
+    'budget',
+    sa.column('id', sa.Integer),
+    sa.column('event_id', sa.Integer),
+    sa.column('allocated_budget', sa.Numeric(10, 2)),
+)
+expense = sa.table(
+    'expense', sa.column('budget_id', sa.Integer), sa.column('amount', sa.Numeric)
+)
+event_stats = sa.table(
+    'event_stats',
+    sa.column('event_id', sa.Integer),
+    sa.column('total_tasks', sa.Integer),
+    sa.column('completed_tasks', sa.Integer),
+    sa.column('participant_count', sa.Integer),
+    sa.column('budget_id', sa.Integer),
+    sa.column('allocated_budget', sa.Numeric(10, 2)),
+    sa.column('total_spent_amount', sa.Numeric(12, 2)),
+)
+
+
+def backfill_event_stats(connection):
+    # Same aggregates as event_stats.compute_event_stats, in one statement
+    count = sa.func.count()
+    first = (
+        sa.select(budget.c.event_id, sa.func.min(budget.c.id).label('budget_id'))
+        .group_by(budget.c.event_id)
+        .subquery()
+    )
+    first_budget = budget.alias('first_budget')
+    rows = sa.select(
+        event.c.id,
+        sa.select(count).where(task.c.event_id == event.c.id).scalar_subquery(),
+        sa.select(count)
+        .where(task.c.event_id == event.c.id, task.c.status == 'Completed')
+        .scalar_subquery(),
+        sa.select(count)
+        .where(participant.c.event_id == event.c.id)
+        .scalar_subquery(),
+        first.c.budget_id,
+        first_budget.c.allocated_budget,
+        sa.select(sa.func.coalesce(sa.func.sum(expense.c.amount), 0))
+        .where(expense.c.budget_id == first.c.budget_id)
+        .scalar_subquery(),
+    ).select_from(
+        event.outerjoin(first, first.c.event_id == event.c.id).outerjoin(
+            first_budget, first_budget.c.id == first.c.budget_id
+        )
+    )
+    connection.execute(
+        event_stats.insert().from_select(
+            [column.name for column in event_stats.c], rows
+        )
+    )
+
+
+def upgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('event_stats',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('total_tasks', sa.Integer(), nullable=False),
+    sa.Column('completed_tasks', sa.Integer(), nullable=False),
+    sa.Column('participant_count', sa.Integer(), nullable=False),
+    sa.Column('budget_id', sa.Integer(), nullable=True),
+    sa.Column('allocated_budget', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('total_spent_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['budget_id'], ['budget.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['event_id'], ['event.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    # ### end Alembic commands ###
+
+    backfill_event_stats(op.get_bind())
+
+
+def downgrade():
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('event_stats')
+    # ### end Alembic commands ###
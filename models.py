@@ -1,15 +1,20 @@
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.ext.hybrid import hybrid_property
-from datetime import datetime
+from datetime import datetime, timezone
 from flask_bcrypt import Bcrypt
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 
 
+def utcnow():
+    # Naive UTC, matching how the other DateTime columns are stored
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class User(db.Model, SerializerMixin):
-    serialize_rules = ("-_password_hash",)  # Exclude password_hash from serialization
+    serialize_rules = ("-password",)  # Exclude the password hash from serialization
 
     id = db.Column(db.Integer, primary_key=True)
     firstname = db.Column(db.String, nullable=False)
@@ -41,18 +46,56 @@ class User(db.Model, SerializerMixin):
 
 
 class Event(db.Model, SerializerMixin):
+    # Child collections are loaded explicitly by the endpoints that need them
+    serialize_rules = ("-tasks", "-resources", "-budgets", "-expenses", "-participants")
+    # (date, id) is the keyset EventList pages over; the filtered variants
+    # let a category or owner filter walk the index in page order too;
+    # (starts_at, id) serves the calendar's range scans
+    __table_args__ = (
+        db.Index("ix_event_date_id", "date", "id"),
+        db.Index("ix_event_category_date_id", "category", "date", "id"),
+        db.Index("ix_event_user_id_date_id", "user_id", "date", "id"),
+        db.Index("ix_event_starts_at_id", "starts_at", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
     title = db.Column(db.String(128))
     date = db.Column(db.DateTime)
     time = db.Column(db.Time)
+    # date and time combined (see event_calendar.py)
+    starts_at = db.Column(db.DateTime)
     image = db.Column(db.String(128))
     location = db.Column(db.String(128))
     description = db.Column(db.Text)
     category = db.Column(db.String(64))
+    # Bumped whenever the event or any of its child rows changes (see
+    # versioning.py); ETags and Last-Modified headers are derived from it.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    updated_at = db.Column(db.DateTime, default=utcnow)
+
+    tasks = db.relationship("Task", back_populates="event", passive_deletes=True)
+    resources = db.relationship(
+        "EventResource", back_populates="event", passive_deletes=True
+    )
+    budgets = db.relationship("Budget", back_populates="event", passive_deletes=True)
+    expenses = db.relationship("Expense", back_populates="event", passive_deletes=True)
+    participants = db.relationship(
+        "Participant", back_populates="event", passive_deletes=True
+    )
 
 
 class Task(db.Model, SerializerMixin):
+    serialize_rules = ("-event", "-prerequisite_links", "-dependent_links")
+    # The first two also serve plain event_id / assigned_to lookups through
+    # their leftmost column; the second is the order of a user's dashboard
+    # tasks and the third the deadline scans of deadlines.py
+    __table_args__ = (
+        db.Index("ix_task_event_id_status", "event_id", "status"),
+        db.Index("ix_task_assigned_to_deadline_id", "assigned_to", "deadline", "id"),
+        db.Index("ix_task_status_deadline_id", "status", "deadline", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey("event.id"))
     assigned_to = db.Column(db.Integer, db.ForeignKey("user.id"))
@@ -62,36 +105,136 @@ class Task(db.Model, SerializerMixin):
     priority = db.Column(db.String(64))
     status = db.Column(db.String(64))
     dependency = db.Column(db.Text)
+    # Prerequisites (TaskDependency rows) that are not Completed yet; kept
+    # current by the session hooks in task_graph.py
+    blocked_by = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    event = db.relationship("Event", back_populates="tasks")
+    # Deleting a task removes its edges in both directions
+    prerequisite_links = db.relationship(
+        "TaskDependency",
+        foreign_keys="TaskDependency.task_id",
+        cascade="all, delete-orphan",
+    )
+    dependent_links = db.relationship(
+        "TaskDependency",
+        foreign_keys="TaskDependency.depends_on_id",
+        cascade="all, delete-orphan",
+    )
+
+
+class TaskDependency(db.Model):
+    """Edge meaning ``task_id`` cannot start before ``depends_on_id`` is done."""
+
+    task_id = db.Column(
+        db.Integer, db.ForeignKey("task.id", ondelete="CASCADE"), primary_key=True
+    )
+    depends_on_id = db.Column(
+        db.Integer,
+        db.ForeignKey("task.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    # Both tasks belong to this event; lets a whole graph load in one query
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), index=True)
 
 
 class EventResource(db.Model, SerializerMixin):
+    serialize_rules = ("-event",)
+    # A (type, name) pair identifies one physical resource across events;
+    # its bookings sorted by start are what reservations.py probes
+    __table_args__ = (
+        db.Index(
+            "ix_event_resource_type_name_reservation_date",
+            "type",
+            "name",
+            "reservation_date",
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey("event.id"))
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), index=True)
     name = db.Column(db.String(128))
     type = db.Column(db.String(64))
     availability = db.Column(db.Boolean)
+    # The booking is [reservation_date, reservation_end); rows without an
+    # end are not bookings and never conflict
     reservation_date = db.Column(db.DateTime)
+    reservation_end = db.Column(db.DateTime)
+
+    event = db.relationship("Event", back_populates="resources")
 
 
 class Budget(db.Model, SerializerMixin):
+    serialize_rules = ("-event",)
+
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey("event.id"))
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), index=True)
     allocated_budget = db.Column(db.Numeric(10, 2))
     # spent_amount = db.Column(db.Numeric(10, 2))
 
+    event = db.relationship("Event", back_populates="budgets")
+
 
 class Expense(db.Model, SerializerMixin):
+    serialize_rules = ("-event",)
+
     id = db.Column(db.Integer, primary_key=True)
-    budget_id = db.Column(db.Integer, db.ForeignKey("budget.id"))
-    event_id = db.Column(db.Integer, db.ForeignKey("event.id"))
+    budget_id = db.Column(db.Integer, db.ForeignKey("budget.id"), index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), index=True)
     name = db.Column(db.Text)
     amount = db.Column(db.Numeric(10, 2))
     date = db.Column(db.DateTime)
 
+    event = db.relationship("Event", back_populates="expenses")
+
 
 class Participant(db.Model, SerializerMixin):
+    serialize_rules = ("-event",)
+
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey("event.id"))
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
     status = db.Column(db.String(64))
     role = db.Column(db.String(64))
+
+    event = db.relationship("Event", back_populates="participants")
+
+
+class EventStats(db.Model):
+    """Per-event rollup kept current by the session hooks in event_stats.py."""
+
+    event_id = db.Column(
+        db.Integer, db.ForeignKey("event.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+    completed_tasks = db.Column(db.Integer, nullable=False, default=0)
+    participant_count = db.Column(db.Integer, nullable=False, default=0)
+    # The report follows the event's first budget, as GenerateBudgetReport does
+    budget_id = db.Column(db.Integer, db.ForeignKey("budget.id", ondelete="SET NULL"))
+    allocated_budget = db.Column(db.Numeric(10, 2))
+    total_spent_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+
+class ChangeLog(db.Model):
+    """One insert, update or delete of an event or its child rows.
+
+    Append-only; written in the transaction of the change (see changefeed.py).
+    """
+
+    # Ids are never reused, even after pruning, since clients resume by id
+    __table_args__ = (
+        db.Index("ix_change_log_event_id_id", "event_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key: the entries of a deleted event outlive it
+    event_id = db.Column(db.Integer, nullable=False)
+    entity = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(8), nullable=False)
+    # JSON: the changed columns of an update, and the row (null once deleted)
+    fields = db.Column(db.Text)
+    data = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
@@ -0,0 +1,272 @@
+"""Opt-in request metrics and sampled profiling.
+
+``RequestMetrics`` times every request, counts the SQL statements it
+issues and the time spent in them (through the engine's cursor events),
+and renders the totals per route in the Prometheus text format:
+
+    http_requests_total               requests by route, method and status
+    http_request_duration_seconds     latency histogram by route and method
+    db_statements_per_request         statement-count histogram, for N+1s
+    db_duration_seconds_total         time spent in SQL by route and method
+
+Routes are labelled with their URL rule (``/events/<int:event_id>``) so the
+label set stays bounded. A fraction of requests can also be profiled, each
+profile written to its own file in PROFILE_DIR. A process profiles one
+request at a time: Python 3.12's cProfile holds the interpreter-wide
+profiler slot, so a sample drawn while another is running (or while
+another profiling tool is active) is skipped. That slot also sees every
+thread, so under threaded workers a profile can include frames of other
+requests.
+
+Configuration (read in ``init_app``):
+
+    METRICS_ENABLED           install the hooks at all (default off)
+    METRICS_QUERY_WARN        log requests issuing more statements (default 50)
+    PROFILE_SAMPLE_RATE       fraction of requests to profile (default 0)
+    PROFILE_DIR               where profiles are written (default "profiles")
+    PROFILER                  "cprofile" (.prof) or "pyinstrument" (.html)
+
+Durations of streamed responses cover producing the response object, not
+sending its body.
+"""
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event as sa_event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Held while a request is being profiled; only one profiler can run at once
+_profiling = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items())
+
+
+class _Profile:
+    """One sampled request's profiler, started and stopped around the view."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise RuntimeError(
+                    "PROFILER=pyinstrument needs the 'pyinstrument' package."
+                )
+            self.profiler = Profiler()
+            self.profiler.start()
+        else:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self, path=None):
+        """Stop profiling and, given a ``path``, write the profile there."""
+        if self.kind == "pyinstrument":
+            self.profiler.stop()
+            if path is not None:
+                with open(path + ".html", "w") as output:
+                    output.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            if path is not None:
+                self.profiler.dump_stats(path + ".prof")
+
+
+def _start_profile(kind):
+    """A started ``_Profile``, or None when another profiler is running."""
+    if not _profiling.acquire(blocking=False):
+        return None
+    try:
+        return _Profile(kind)
+    except ValueError:
+        # "Another profiling tool is already active"
+        _profiling.release()
+        return None
+    except BaseException:
+        _profiling.release()
+        raise
+
+
+def _stop_profile(profile, path=None):
+    try:
+        profile.stop(path)
+    finally:
+        _profiling.release()
+
+
+class RequestMetrics:
+    def __init__(self, app=None, engine=None):
+        self._lock = threading.Lock()
+        self.reset()
+        if app is not None:
+            self.init_app(app, engine)
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.latency = {}
+            self.statements = {}
+            self.db_time = defaultdict(float)
+
+    def init_app(self, app, engine):
+        self.enabled = app.config.get("METRICS_ENABLED", False)
+        self.query_warn = app.config.get("METRICS_QUERY_WARN", 50)
+        self.sample_rate = app.config.get("PROFILE_SAMPLE_RATE", 0.0)
+        self.profile_dir = app.config.get("PROFILE_DIR", "profiles")
+        self.profiler = app.config.get("PROFILER", "cprofile")
+        self.logger = app.logger
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        sa_event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        sa_event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_statements = 0
+        g.metrics_db_time = 0.0
+        g.metrics_profile = None
+        if self.sample_rate and random.random() < self.sample_rate:
+            g.metrics_profile = _start_profile(self.profiler)
+
+    def _after_request(self, response):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+        duration = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        method = request.method
+        statements = g.pop("metrics_statements", 0)
+        db_time = g.pop("metrics_db_time", 0.0)
+
+        profile = g.pop("metrics_profile", None)
+        if profile is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            name = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+            path = os.path.join(
+                self.profile_dir, f"{time.time():.6f}-{method}-{name}"
+            )
+            _stop_profile(profile, path)
+
+        with self._lock:
+            key = (route, method)
+            self.requests[(route, method, response.status_code)] += 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.statements.setdefault(key, Histogram(STATEMENT_BUCKETS)).observe(
+                statements
+            )
+            self.db_time[key] += db_time
+
+        if self.query_warn and statements > self.query_warn:
+            self.logger.warning(
+                "%s %s issued %d SQL statements (%.1f ms in the database)",
+                method,
+                request.full_path.rstrip("?"),
+                statements,
+                db_time * 1000,
+            )
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request is skipped when the view raised; never keep profiling
+        profile = g.pop("metrics_profile", None)
+        if profile is not None:
+            _stop_profile(profile)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+        # Statements issued outside a request (CLI, background work) are
+        # not attributed to any route.
+        if has_request_context() and "metrics_statements" in g:
+            g.metrics_statements += 1
+            g.metrics_db_time += elapsed
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            latency = sorted(self.latency.items())
+            statements = sorted(self.statements.items())
+            db_time = sorted(self.db_time.items())
+
+            lines = [
+                "# HELP http_requests_total Requests handled, by route and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (route, method, status), count in requests:
+                labels = _labels(route=route, method=method, status=status)
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            lines += self._histogram_lines(
+                "http_request_duration_seconds",
+                "Request latency in seconds.",
+                latency,
+            )
+            lines += self._histogram_lines(
+                "db_statements_per_request",
+                "SQL statements issued per request.",
+                statements,
+            )
+
+            lines += [
+                "# HELP db_duration_seconds_total Time spent executing SQL.",
+                "# TYPE db_duration_seconds_total counter",
+            ]
+            for (route, method), seconds in db_time:
+                labels = _labels(route=route, method=method)
+                lines.append(f"db_duration_seconds_total{{{labels}}} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name, help_text, histograms):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (route, method), histogram in histograms:
+            labels = _labels(route=route, method=method)
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
@@ -0,0 +1,96 @@
+"""JSON encoders for the API's application/json representation.
+
+Flask-RESTful encodes every response with ``json.dumps``, which formats
+Decimal and datetime values only when the endpoint has already turned them
+into strings row by row. ``create_encoder(name)`` returns one of:
+
+    orjson   orjson.dumps, with datetime/date/time encoded natively and
+             Decimal as its string form
+    json     the standard library, with the same conversions in Python
+
+Both produce the same documents (orjson without the optional whitespace).
+``encoder.fragment(encoded)`` wraps JSON that was encoded earlier, e.g. a
+cached response body, so it is embedded verbatim instead of being parsed
+and encoded again; the stdlib encoder has to parse it.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask import make_response
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonEncoder:
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise RuntimeError("API_JSON_ENCODER=orjson needs the 'orjson' package.")
+        self._dumps = orjson.dumps
+        self.fragment = orjson.Fragment
+        # Dict keys other than str (e.g. ids) are stringified like json.dumps
+        self._options = orjson.OPT_NON_STR_KEYS
+        self._response_options = self._options | orjson.OPT_APPEND_NEWLINE
+
+    def encode(self, data):
+        return self._dumps(data, default=_default, option=self._options)
+
+    def dumps(self, data):
+        """Encode a response body, newline-terminated like Flask-RESTful's."""
+        return self._dumps(data, default=_default, option=self._response_options)
+
+
+class Fragment:
+    def __init__(self, contents):
+        self.contents = contents
+
+
+class StdlibEncoder:
+    name = "json"
+    fragment = Fragment
+
+    @staticmethod
+    def _default(value):
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, Fragment):
+            return json.loads(value.contents)
+        return _default(value)
+
+    def encode(self, data):
+        if isinstance(data, Fragment):
+            data = json.loads(data.contents)
+        return json.dumps(data, default=self._default).encode("utf-8")
+
+    def dumps(self, data):
+        return self.encode(data) + b"\n"
+
+
+ENCODERS = {"orjson": OrjsonEncoder, "json": StdlibEncoder}
+
+
+def create_encoder(name):
+    if name not in ENCODERS:
+        raise RuntimeError(
+            f"Unknown API_JSON_ENCODER {name!r}; expected one of {sorted(ENCODERS)}."
+        )
+    return ENCODERS[name]()
+
+
+def json_representation(encoder):
+    """Return an ``Api.representation`` output function using ``encoder``."""
+
+    def output_json(data, code, headers=None):
+        response = make_response(encoder.dumps(data), code)
+        response.headers.extend(headers or {})
+        return response
+
+    return output_json
@@ -0,0 +1,142 @@
+"""Conflict detection for resource bookings.
+
+An EventResource row with both ``reservation_date`` and ``reservation_end``
+books the resource identified by its (type, name) for the half-open
+interval [reservation_date, reservation_end). Writes keep the bookings of
+each resource disjoint, so sorted by start they are sorted by end as well,
+and the only booking that can overlap [start, end) is the last one starting
+before ``end``. Every check is therefore one backwards probe of the
+(type, name, reservation_date) index: O(log n) however many bookings exist.
+
+Writers flush their rows first and then call ``check_bookings`` with the
+written ids, so on SQLite the transaction already holds the write lock and
+a concurrent booking cannot slip in between the check and the commit.
+"""
+from itertools import groupby
+
+from sqlalchemy import or_, select
+
+from models import EventResource
+
+
+def _latest_booking_before(resource_type, name, end, *columns):
+    return (
+        select(*columns)
+        .where(
+            EventResource.type == resource_type,
+            EventResource.name == name,
+            EventResource.reservation_date < end,
+            EventResource.reservation_end.is_not(None),
+        )
+        .order_by(EventResource.reservation_date.desc())
+        .limit(1)
+    )
+
+
+def find_conflict(session, resource_type, name, start, end, exclude_ids=()):
+    """Return the booking of (type, name) overlapping [start, end), or None.
+
+    Bookings in ``exclude_ids`` are ignored; the others must be disjoint.
+    """
+    query = _latest_booking_before(
+        resource_type,
+        name,
+        end,
+        EventResource.id,
+        EventResource.event_id,
+        EventResource.reservation_date,
+        EventResource.reservation_end,
+    )
+    if exclude_ids:
+        query = query.where(EventResource.id.not_in(exclude_ids))
+    booking = session.execute(query).first()
+    if booking is not None and booking.reservation_end > start:
+        return booking
+    return None
+
+
+def free_resources(session, resource_type, start, end):
+    """Names of the resources of ``resource_type`` free for all of
+    [start, end), each checked with one index probe."""
+    names = (
+        select(EventResource.type, EventResource.name)
+        .where(EventResource.type == resource_type)
+        .distinct()
+        .subquery()
+    )
+    booked_until = _latest_booking_before(
+        names.c.type, names.c.name, end, EventResource.reservation_end
+    ).scalar_subquery()
+    query = (
+        select(names.c.name)
+        .where(or_(booked_until.is_(None), booked_until <= start))
+        .order_by(names.c.name)
+    )
+    return list(session.execute(query).scalars())
+
+
+def booking_payload(booking):
+    return {
+        "id": booking.id,
+        "event_id": booking.event_id,
+        "reservation_date": booking.reservation_date.isoformat(),
+        "reservation_end": booking.reservation_end.isoformat(),
+    }
+
+
+def check_bookings(session, ids):
+    """Validate the flushed rows ``ids`` against each other and all others.
+
+    Returns (invalid, conflicts): the ids whose window is malformed (an end
+    without a start, or not after it), and a list of {"id", "conflict"}
+    entries for rows overlapping another booking of the same resource.
+    """
+    ids = list(ids)
+    rows = session.execute(
+        select(
+            EventResource.id,
+            EventResource.event_id,
+            EventResource.type,
+            EventResource.name,
+            EventResource.reservation_date,
+            EventResource.reservation_end,
+        ).where(EventResource.id.in_(ids))
+    ).all()
+    invalid = []
+    bookings = []
+    for row in rows:
+        if row.reservation_end is None:
+            continue
+        start = row.reservation_date
+        if start is None or row.reservation_end <= start:
+            invalid.append(row.id)
+        else:
+            bookings.append(row)
+    invalid.sort()
+    bookings.sort(
+        key=lambda row: (row.type or "", row.name or "", row.reservation_date)
+    )
+
+    conflicts = []
+    # The rows written together may overlap each other...
+    for _, group in groupby(bookings, key=lambda row: (row.type, row.name)):
+        previous = None
+        for row in group:
+            start = row.reservation_date
+            if previous is not None and previous.reservation_end > start:
+                conflicts.append({"id": row.id, "conflict": booking_payload(previous)})
+            if previous is None or row.reservation_end > previous.reservation_end:
+                previous = row
+    # ...or an existing booking, which are disjoint among themselves
+    for row in bookings:
+        booking = find_conflict(
+            session,
+            row.type,
+            row.name,
+            row.reservation_date,
+            row.reservation_end,
+            exclude_ids=ids,
+        )
+        if booking is not None:
+            conflicts.append({"id": row.id, "conflict": booking_payload(booking)})
+    return invalid, conflicts
@@ -0,0 +1,202 @@
+"""Full-text search over events and tasks with SQLite FTS5.
+
+``event_fts`` indexes the title, description and location of events and
+``task_fts`` the title and description of tasks. Both are external-content
+FTS5 tables: they hold only the inverted index and read rows back from
+``event``/``task`` by rowid. Triggers keep them in step with every write,
+including bulk and driver-level ones that bypass the ORM, and fire only when
+an indexed column changes, so version bumps and status updates cost nothing.
+
+Each word of a query becomes a prefix term ("conf" matches "conference")
+and every term must match. Results are ranked by bm25 with matches in the
+title weighted above the location and the description; facet counts for a
+field ignore the filter on that same field, so a client can offer the other
+values. The tables exist on SQLite only.
+"""
+import re
+
+from sqlalchemy import and_, column, func, literal_column, select, table
+from sqlalchemy import event as sa_event
+
+from models import db, Event, Task
+
+EVENT_COLUMNS = ("title", "description", "location")
+TASK_COLUMNS = ("title", "description")
+# bm25 weights, in column order
+EVENT_WEIGHTS = (10.0, 1.0, 2.0)
+TASK_WEIGHTS = (10.0, 1.0)
+
+
+def _index_ddl(name, source, columns):
+    """Statements creating ``name`` over ``source`` and its sync triggers."""
+    listed = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {name}({name}, rowid, {listed}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert_new = f"INSERT INTO {name}(rowid, {listed}) VALUES (new.id, {new});"
+    table_ddl = (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({listed}, "
+        f"content='{source}', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    trigger_ddl = [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {listed} "
+        f"ON {source} BEGIN {delete_old} {insert_new} END",
+    ]
+    return table_ddl, trigger_ddl
+
+
+INDEXES = {
+    "event_fts": _index_ddl("event_fts", "event", EVENT_COLUMNS),
+    "task_fts": _index_ddl("task_fts", "task", TASK_COLUMNS),
+}
+
+
+def search_supported(connection):
+    return connection.dialect.name == "sqlite"
+
+
+def search_index_exists(connection):
+    return search_supported(connection) and bool(
+        connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_fts'"
+        ).first()
+    )
+
+
+def create_search_triggers(connection):
+    for _, trigger_ddl in INDEXES.values():
+        for statement in trigger_ddl:
+            connection.exec_driver_sql(statement)
+
+
+def drop_search_triggers(connection):
+    for name in INDEXES:
+        for suffix in ("ai", "ad", "au"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}_{suffix}")
+
+
+def rebuild_search_index(connection):
+    """Re-read every indexed row, e.g. after loading with the triggers off."""
+    for name in INDEXES:
+        connection.exec_driver_sql(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def create_search_index(connection):
+    for table_ddl, _ in INDEXES.values():
+        connection.exec_driver_sql(table_ddl)
+    create_search_triggers(connection)
+    rebuild_search_index(connection)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def _create_after_tables(target, connection, **kw):
+    if search_supported(connection):
+        create_search_index(connection)
+
+
+@sa_event.listens_for(db.metadata, "before_drop")
+def _drop_before_tables(target, connection, **kw):
+    if search_supported(connection):
+        for name in INDEXES:
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {name}")
+
+
+def match_expression(query):
+    """Turn free text into an FTS5 query of quoted prefix terms, or None."""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    # \w+ words cannot contain quotes or FTS5 operators
+    return " AND ".join(f'"{word}"*' for word in words)
+
+
+def _facet(session, base, joined, where, key):
+    rows = session.execute(
+        select(key.label("value"), func.count().label("count"))
+        .select_from(joined)
+        .where(*base, *where)
+        .group_by(key)
+        .order_by(func.count().desc(), key)
+    ).all()
+    return [{"value": row.value, "count": row.count} for row in rows]
+
+
+def _search(session, fts_name, model, weights, match, filters, facets, page):
+    """Rank, count and facet one index. ``filters`` and ``facets`` are keyed
+    by facet name; a facet skips its own filter."""
+    fts_table = table(fts_name, column("rowid"))
+    fts = literal_column(fts_name)
+    joined = fts_table.join(model.__table__, model.id == fts_table.c.rowid)
+    base = [fts.op("MATCH")(match)]
+    where = [condition for condition in filters.values() if condition is not None]
+
+    score = func.bm25(fts, *weights)
+    limit, offset = page
+    rows = session.execute(
+        select(model.__table__, (-score).label("score"))
+        .select_from(joined)
+        .where(*base, *where)
+        .order_by(score, model.id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    total = session.execute(
+        select(func.count()).select_from(joined).where(*base, *where)
+    ).scalar()
+    facet_counts = {
+        name: _facet(
+            session,
+            base,
+            joined,
+            [
+                condition
+                for other, condition in filters.items()
+                if other != name and condition is not None
+            ],
+            key,
+        )
+        for name, key in facets.items()
+    }
+    return total, rows, facet_counts
+
+
+def search_events(session, match, page, category=None, start=None, end=None):
+    dates = []
+    if start is not None:
+        dates.append(Event.date >= start)
+    if end is not None:
+        dates.append(Event.date < end)
+    return _search(
+        session,
+        "event_fts",
+        Event,
+        EVENT_WEIGHTS,
+        match,
+        {
+            "category": Event.category == category if category else None,
+            "month": and_(*dates) if dates else None,
+        },
+        {"category": Event.category, "month": func.strftime("%Y-%m", Event.date)},
+        page,
+    )
+
+
+def search_tasks(session, match, page, status=None):
+    return _search(
+        session,
+        "task_fts",
+        Task,
+        TASK_WEIGHTS,
+        match,
+        {"status": Task.status == status if status else None},
+        {"status": Task.status},
+        page,
+    )
@@ -1,485 +1,499 @@
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from flask_bcrypt import Bcrypt
-from models import db, User, Event, Task, EventResource, Budget, Expense, Participant
-
-# Adjust the database URI as needed
-engine = create_engine("sqlite:///instance/app.db")
-Session = sessionmaker(bind=engine)
-session = Session()
-
-
-def seed_users():
-    users = [
-        User(
-            username="john_doe",
-            email="john@example.com",
-            firstname="John",
-            lastname="Doe",
-            address="123 Main St",
-            city="Anytown",
-            country="Country",
-            postal_code="12345",
-            aboutme="Lorem ipsum dolor sit amet.",
-            password="password1",
-        ),
-        User(
-            username="jane_doe",
-            email="jane@example.com",
-            firstname="Jane",
-            lastname="Doe",
-            address="456 Elm St",
-            city="Othertown",
-            country="Country",
-            postal_code="54321",
-            aboutme="Consectetur adipiscing elit.",
-            password="password1",
-        ),
-        User(
-            username="alex_smith",
-            email="alex@example.com",
-            firstname="Alex",
-            lastname="Smith",
-            address="789 Pine St",
-            city="Sometown",
-            country="Country",
-            postal_code="67890",
-            aboutme="Sed do eiusmod tempor incididunt.",
-            password="password1",
-        ),
-        User(
-            username="linda_white",
-            email="linda@example.com",
-            firstname="Linda",
-            lastname="White",
-            address="101 Maple Ave",
-            city="Newtown",
-            country="Country",
-            postal_code="98765",
-            aboutme="Ut labore et dolore magna aliqua.",
-            password="password1",
-        ),
-        User(
-            username="david_brown",
-            email="david@example.com",
-            firstname="David",
-            lastname="Brown",
-            address="202 Oak St",
-            city="Oldtown",
-            country="Country",
-            postal_code="24680",
-            aboutme="Ut enim ad minim veniam.",
-            password="password1",
-        ),
+"""Fill the database with a synthetic dataset of any size.
+
+Run from the project root:
+
+    python seed.py                                   # small development set
+    python seed.py --users 100000 --events 50000 --tasks-per-event 40
+
+Rows are built from ``--seed``, so the same arguments always produce the
+same data, and are written with executemany inserts in one transaction per
+``--chunk-size`` users or events; each event chunk also refreshes its
+EventStats rows. Ids continue after the largest existing ones, so a run
+appends to whatever the database already holds. For large loads,
+``--defer-indexes`` drops the secondary indexes first and rebuilds them
+(and the stats and full-text index) at the end, which is much cheaper than
+maintaining them row by row.
+
+Passwords come from a small pool (``password1`` .. ``passwordN``) that is
+bcrypt-hashed once up front with ``--bcrypt-rounds``; user ``n`` logs in
+with ``password{(n - 1) % N + 1}``. Use the same work factor as the app's
+BCRYPT_LOG_ROUNDS or every first login will rehash.
+
+The target is ``--database-url``, else DATABASE_URL, else instance/app.db.
+``--create-tables`` creates missing tables on an empty database; otherwise
+the schema is expected to come from ``flask db upgrade``.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from database import DEFAULTS, database_uri, register_sqlite_pragmas
+from event_stats import refresh_event_stats
+from hashing import _hash_password
+from models import db, utcnow
+from models import User, Event, Task, EventResource, Budget, Expense, Participant
+from search import (
+    create_search_triggers,
+    drop_search_triggers,
+    rebuild_search_index,
+    search_index_exists,
+)
+
+FIRSTNAMES = ("John", "Jane", "Alex", "Linda", "David", "Maria", "Wei", "Amara")
+LASTNAMES = ("Doe", "Smith", "White", "Brown", "Garcia", "Chen", "Okafor")
+CITIES = ("Anytown", "Othertown", "Sometown", "Newtown", "Oldtown")
+EVENT_KINDS = (
+    ("Tech Conference", "Professional", "Conference Center"),
+    ("Hackathon", "Professional", "Tech Hub"),
+    ("Wedding", "Personal", "Sunny Meadows"),
+    ("Birthday Party", "Social", "Community Hall"),
+    ("Charity Run", "Social", "City Park"),
+)
+TASK_TITLES = (
+    "Book Catering Service",
+    "Venue Decoration",
+    "Hire Security",
+    "Confirm Guest Speakers",
+    "Print Event Materials",
+    "Social Media Campaign",
+    "Arrange Transportation",
+    "Coordinate Volunteers",
+)
+PRIORITIES = ("High", "Medium", "Low")
+TASK_STATUSES = ("Not Started", "Pending", "In Progress", "Completed")
+RESOURCES = (
+    ("Projector", "Equipment"),
+    ("Microphone", "Equipment"),
+    ("Conference Room", "Location"),
+    ("Outdoor Stage", "Location"),
+    ("Catering Services", "Service"),
+    ("Chair Rental", "Service"),
+)
+EXPENSE_NAMES = (
+    "Sound System Rental",
+    "Decorations",
+    "Venue Booking",
+    "Transportation",
+)
+PARTICIPANT_STATUSES = ("Confirmed", "Pending")
+ROLES = ("Speaker", "Guest", "Attendee", "Organizer", "Volunteer")
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--tasks-per-event", type=int, default=10)
+    parser.add_argument("--resources-per-event", type=int, default=3)
+    parser.add_argument("--budgets-per-event", type=int, default=1)
+    parser.add_argument("--expenses-per-event", type=int, default=5)
+    parser.add_argument("--participants-per-event", type=int, default=5)
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--days", type=int, default=365, help="span of event dates")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password-pool", type=int, default=4)
+    parser.add_argument(
+        "--bcrypt-rounds",
+        type=int,
+        default=int(os.environ.get("BCRYPT_LOG_ROUNDS", 12)),
+    )
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="drop secondary indexes during the load and rebuild them after",
+    )
+
+
+def _next_id(connection, model):
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _chunks(first, count, size):
+    for start in range(first, first + count, size):
+        yield range(start, min(start + size, first + count))
+
+
+def bulk_insert(connection, model, columns, rows):
+    """executemany ``rows`` (tuples in ``columns`` order) into ``model``.
+
+    Rows go to the driver directly: SQLAlchemy's per-row parameter handling
+    costs more than the insert itself. The column types' bind processors
+    still run, memoized because generated values repeat heavily, but Python
+    column defaults do not, so ``columns`` must cover them.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    dialect = connection.dialect
+    compiled = insert(table).compile(dialect=dialect, column_keys=columns)
+    processors = [
+        (index, table.c[name].type.dialect_impl(dialect).bind_processor(dialect))
+        for index, name in enumerate(columns)
     ]
+    processors = [(index, process) for index, process in processors if process]
+    if processors:
+        memos = {index: {} for index, _ in processors}
+        processed = []
+        for row in rows:
+            row = list(row)
+            for index, process in processors:
+                value = row[index]
+                memo = memos[index]
+                if value not in memo:
+                    memo[value] = process(value)
+                row[index] = memo[value]
+            processed.append(tuple(row))
+        rows = processed
+    if compiled.positional:
+        # Columns compile in table order, which need not be ``columns`` order
+        order = [columns.index(name) for name in compiled.positiontup]
+        if order == sorted(order):
+            params = rows
+        else:
+            params = [tuple(row[index] for index in order) for row in rows]
+    else:
+        params = [dict(zip(columns, row)) for row in rows]
+    connection.exec_driver_sql(compiled.string, params)
 
-    session.add_all(users)
-    session.commit()
 
+USER_COLUMNS = (
+    "id",
+    "firstname",
+    "lastname",
+    "username",
+    "address",
+    "city",
+    "country",
+    "postal_code",
+    "aboutme",
+    "email",
+    "password",
+)
 
-def seed_events():
-    events = [
-        Event(
-            user_id=1,
-            title="Tech Conference",
-            date=datetime.now() + timedelta(days=30),
-            time=datetime.now().time(),
-            location="Conference Center",
-            description="A conference about tech.",
-            category="Professional",
-        ),
-        Event(
-            user_id=2,
-            title="Wedding",
-            date=datetime.now() + timedelta(days=90),
-            time=datetime.now().time(),
-            location="Sunny Meadows",
-            description="Celebrating love.",
-            category="Personal",
-        ),
-        Event(
-            user_id=3,
-            title="Hackathon",
-            date=datetime.now() + timedelta(days=60),
-            time=datetime.now().time(),
-            location="Tech Hub",
-            description="Coding competition.",
-            category="Professional",
-        ),
-        Event(
-            user_id=4,
-            title="Birthday Party",
-            date=datetime.now() + timedelta(days=20),
-            time=datetime.now().time(),
-            location="John's House",
-            description="John's 30th birthday.",
-            category="Social",
-        ),
-        Event(
-            user_id=5,
-            title="Charity Run",
-            date=datetime.now() + timedelta(days=45),
-            time=datetime.now().time(),
-            location="City Park",
-            description="5k run for charity.",
-            category="Social",
-        ),
+
+def user_rows(rng, ids, pool):
+    n = len(ids)
+    return [
+        (
+            user_id,
+            firstname,
+            lastname,
+            f"user{user_id}",
+            f"{number} Main St",
+            city,
+            "Country",
+            postal_code,
+            f"{firstname} {lastname}, synthetic user {user_id}.",
+            f"user{user_id}@example.com",
+            pool[(user_id - 1) % len(pool)],
+        )
+        for user_id, firstname, lastname, number, city, postal_code in zip(
+            ids,
+            rng.choices(FIRSTNAMES, k=n),
+            rng.choices(LASTNAMES, k=n),
+            rng.choices(range(1, 1000), k=n),
+            rng.choices(CITIES, k=n),
+            rng.choices(range(10000, 100000), k=n),
+        )
     ]
-    session.add_all(events)
-    session.commit()
-
-
-def seed_tasks():
-    tasks = [
-        Task(
-            event_id=1,
-            assigned_to=1,
-            title="Prepare Keynote Speech",
-            description="Finalize the slides for the keynote speech.",
-            deadline=datetime.now() + timedelta(days=10),
-            priority="High",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=2,
-            assigned_to=2,
-            title="Book Catering Service",
-            description="Confirm the menu and number of guests with the caterer.",
-            deadline=datetime.now() + timedelta(days=20),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=1,
-            assigned_to=3,
-            title="Venue Decoration",
-            description="Design and approve the decoration plans for the venue.",
-            deadline=datetime.now() + timedelta(days=15),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=3,
-            assigned_to=2,
-            title="Hire Security",
-            description="Hire security personnel for the event.",
-            deadline=datetime.now() + timedelta(days=5),
-            priority="High",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=4,
-            assigned_to=4,
-            title="Confirm Guest Speakers",
-            description="Finalize the list of guest speakers and confirm their attendance.",
-            deadline=datetime.now() + timedelta(days=30),
-            priority="High",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=5,
-            assigned_to=5,
-            title="Print Event Materials",
-            description="Design and print all necessary event materials.",
-            deadline=datetime.now() + timedelta(days=7),
-            priority="Low",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=2,
-            assigned_to=1,
-            title="Social Media Campaign",
-            description="Launch a social media campaign to promote the event.",
-            deadline=datetime.now() + timedelta(days=12),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=3,
-            assigned_to=3,
-            title="Prepare Participant Packets",
-            description="Prepare welcome packets for all participants.",
-            deadline=datetime.now() + timedelta(days=14),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=4,
-            assigned_to=2,
-            title="Arrange Transportation",
-            description="Arrange transportation for guests arriving from out of town.",
-            deadline=datetime.now() + timedelta(days=25),
-            priority="Low",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=2,
-            assigned_to=4,
-            title="Finalize Event Schedule",
-            description="Finalize and publish the schedule for the event.",
-            deadline=datetime.now() + timedelta(days=18),
-            priority="High",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=4,
-            assigned_to=5,
-            title="Coordinate Volunteers",
-            description="Assign roles and responsibilities to volunteers.",
-            deadline=datetime.now() + timedelta(days=3),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=3,
-            assigned_to=2,
-            title="Setup Online Registration",
-            description="Ensure the online registration portal is functional.",
-            deadline=datetime.now() + timedelta(days=17),
-            priority="High",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=4,
-            assigned_to=1,
-            title="Confirm Event Insurance",
-            description="Confirm all necessary insurance policies for the event.",
-            deadline=datetime.now() + timedelta(days=22),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=5,
-            assigned_to=4,
-            title="Develop Event App",
-            description="Develop and test the event mobile application.",
-            deadline=datetime.now() + timedelta(days=27),
-            priority="Low",
-            status="Not Started",
-            dependency="None",
-        ),
-        Task(
-            event_id=5,
-            assigned_to=1,
-            title="Plan Networking Activities",
-            description="Plan and schedule networking activities for attendees.",
-            deadline=datetime.now() + timedelta(days=19),
-            priority="Medium",
-            status="Not Started",
-            dependency="None",
-        ),
+
+
+EVENT_COLUMNS = (
+    "id",
+    "user_id",
+    "title",
+    "date",
+    "time",
+    "starts_at",
+    "location",
+    "description",
+    "category",
+    "version",
+    "updated_at",
+)
+
+
+def event_rows(rng, ids, user_ids, args):
+    start = datetime.combine(args.start, datetime.min.time())
+    created = utcnow()
+    n = len(ids)
+    rows = []
+    for event_id, (title, category, location), owner, day, hour in zip(
+        ids,
+        rng.choices(EVENT_KINDS, k=n),
+        rng.choices(user_ids, k=n),
+        rng.choices(range(args.days), k=n),
+        rng.choices(range(8, 21), k=n),
+    ):
+        when = start + timedelta(days=day, hours=hour)
+        rows.append(
+            (
+                event_id,
+                owner,
+                f"{title} #{event_id}",
+                when,
+                when.time(),
+                when,
+                location,
+                f"Synthetic {category.lower()} event.",
+                category,
+                1,
+                created,
+            )
+        )
+    return rows
+
+
+TASK_COLUMNS = (
+    "event_id",
+    "assigned_to",
+    "title",
+    "description",
+    "deadline",
+    "priority",
+    "status",
+    "dependency",
+    "blocked_by",
+)
+RESOURCE_COLUMNS = ("event_id", "name", "type", "availability", "reservation_date")
+BUDGET_COLUMNS = ("id", "event_id", "allocated_budget")
+EXPENSE_COLUMNS = ("budget_id", "event_id", "name", "amount", "date")
+PARTICIPANT_COLUMNS = ("event_id", "user_id", "status", "role")
+
+DAYS_BEFORE = [timedelta(days=days) for days in range(61)]
+
+
+def _repeat(events, times):
+    """Each (event_id, date) pair of the event rows, ``times`` times."""
+    return [(row[0], row[3]) for row in events for _ in range(times)]
+
+
+def task_rows(rng, events, user_ids, args):
+    parents = _repeat(events, args.tasks_per_event)
+    n = len(parents)
+    return [
+        (
+            event_id,
+            assignee,
+            title,
+            "Synthetic task.",
+            when - before,
+            priority,
+            status,
+            "None",
+            0,
+        )
+        for (event_id, when), assignee, title, before, priority, status in zip(
+            parents,
+            rng.choices(user_ids, k=n),
+            rng.choices(TASK_TITLES, k=n),
+            rng.choices(DAYS_BEFORE[:31], k=n),
+            rng.choices(PRIORITIES, k=n),
+            rng.choices(TASK_STATUSES, k=n),
+        )
     ]
-    session.add_all(tasks)
-    session.commit()
-
-
-def seed_resources():
-    resources = [
-        EventResource(
-            event_id=1,
-            name="Projector",
-            type="Equipment",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=2,
-            name="Venue",
-            type="Location",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=3,
-            name="Microphone",
-            type="Equipment",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=4,
-            name="Conference Room",
-            type="Location",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=5,
-            name="Laptop",
-            type="Equipment",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=1,
-            name="Outdoor Stage",
-            type="Location",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=3,
-            name="Video Camera",
-            type="Equipment",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=4,
-            name="Catering Services",
-            type="Service",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=5,
-            name="Chair Rental",
-            type="Service",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
-        EventResource(
-            event_id=5,
-            name="Table Rental",
-            type="Service",
-            availability=True,
-            reservation_date=datetime.now(),
-        ),
+
+
+def resource_rows(rng, events, args):
+    parents = _repeat(events, args.resources_per_event)
+    n = len(parents)
+    return [
+        (event_id, name, kind, available < 0.8, when)
+        for (event_id, when), (name, kind), available in zip(
+            parents,
+            rng.choices(RESOURCES, k=n),
+            [rng.random() for _ in range(n)],
+        )
     ]
-    session.add_all(resources)
-    session.commit()
-
-
-def seed_budgets():
-    budgets = [
-        Budget(event_id=1, allocated_budget=10000.00),
-        Budget(event_id=1, allocated_budget=12000.00),
-        Budget(event_id=2, allocated_budget=20000.00),
-        Budget(event_id=2, allocated_budget=22000.00),
-        Budget(event_id=3, allocated_budget=15000.00),
-        Budget(event_id=3, allocated_budget=17000.00),
-        Budget(event_id=4, allocated_budget=25000.00),
-        Budget(event_id=4, allocated_budget=27000.00),
-        Budget(event_id=5, allocated_budget=18000.00),
-        Budget(event_id=5, allocated_budget=20000.00),
+
+
+def budget_rows(rng, events, first_budget_id, args):
+    parents = _repeat(events, args.budgets_per_event)
+    return [
+        (budget_id, event_id, amount * 100)
+        for budget_id, (event_id, _), amount in zip(
+            range(first_budget_id, first_budget_id + len(parents)),
+            parents,
+            rng.choices(range(50, 301), k=len(parents)),
+        )
     ]
-    session.add_all(budgets)
-    session.commit()
-
-
-def seed_expenses():
-    expenses = [
-        Expense(
-            budget_id=1,
-            event_id=1,
-            name="Sound System Rental",
-            amount=1500.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=1,
-            event_id=1,
-            name="Catering Services",
-            amount=2500.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=2,
-            event_id=2,
-            name="Decorations",
-            amount=2000.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=2,
-            event_id=2,
-            name="Venue Booking",
-            amount=5000.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=3,
-            event_id=3,
-            name="Marketing Materials",
-            amount=1200.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=3,
-            event_id=3,
-            name="Guest Speaker Fees",
-            amount=3000.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=4,
-            event_id=4,
-            name="Lighting Equipment",
-            amount=1800.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=4,
-            event_id=4,
-            name="Security Services",
-            amount=2200.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=5,
-            event_id=5,
-            name="Transportation",
-            amount=1500.00,
-            date=datetime.now(),
-        ),
-        Expense(
-            budget_id=5,
-            event_id=5,
-            name="Accommodation",
-            amount=4000.00,
-            date=datetime.now(),
-        ),
+
+
+def expense_rows(rng, events, budgets, args):
+    budget_ids = {}
+    for budget_id, event_id, _ in budgets:
+        budget_ids.setdefault(event_id, []).append(budget_id)
+    parents = [
+        (event_id, when)
+        for event_id, when in _repeat(events, args.expenses_per_event)
+        if event_id in budget_ids
+    ]
+    n = len(parents)
+    return [
+        (rng.choice(budget_ids[event_id]), event_id, name, cents / 100, when - before)
+        for (event_id, when), name, cents, before in zip(
+            parents,
+            rng.choices(EXPENSE_NAMES, k=n),
+            rng.choices(range(100, 500001), k=n),
+            rng.choices(DAYS_BEFORE, k=n),
+        )
+    ]
+
+
+def participant_rows(rng, events, user_ids, args):
+    per_event = min(args.participants_per_event, len(user_ids))
+    attendees = [
+        user_id for row in events for user_id in rng.sample(user_ids, per_event)
+    ]
+    parents = _repeat(events, per_event)
+    n = len(parents)
+    return [
+        (event_id, user_id, status, role)
+        for (event_id, _), user_id, status, role in zip(
+            parents,
+            attendees,
+            rng.choices(PARTICIPANT_STATUSES, k=n),
+            rng.choices(ROLES, k=n),
+        )
+    ]
+
+
+def secondary_indexes():
+    """Non-unique indexes of the bulk-loaded tables."""
+    return [
+        index
+        for model in (User, Event, Task, EventResource, Budget, Expense, Participant)
+        for index in model.__table__.indexes
+        if not index.unique
     ]
-    session.add_all(expenses)
-    session.commit()
 
 
-def seed_participants():
-    participants = [
-        Participant(event_id=1, user_id=1, status="Confirmed", role="Speaker"),
-        Participant(event_id=2, user_id=2, status="Confirmed", role="Guest"),
-        Participant(event_id=1, user_id=3, status="Pending", role="Attendee"),
-        Participant(event_id=3, user_id=4, status="Confirmed", role="Organizer"),
-        Participant(event_id=2, user_id=5, status="Confirmed", role="Volunteer"),
+def generate(engine, args, echo=print):
+    """Write the dataset described by ``args`` and return row counts."""
+    rng = random.Random(args.seed)
+    counts = dict.fromkeys(
+        (
+            "users",
+            "events",
+            "tasks",
+            "resources",
+            "budgets",
+            "expenses",
+            "participants",
+        ),
+        0,
+    )
+
+    started = time.perf_counter()
+    pool = [
+        _hash_password(f"password{n}", args.bcrypt_rounds)
+        for n in range(1, args.password_pool + 1)
     ]
-    session.add_all(participants)
-    session.commit()
+    echo(f"hashed {len(pool)} passwords in {time.perf_counter() - started:.2f}s")
+
+    with engine.connect() as connection:
+        first_user = _next_id(connection, User)
+        first_event = _next_id(connection, Event)
+        budget_id = _next_id(connection, Budget)
+        existing_users = list(connection.execute(select(User.id)).scalars())
+
+    if args.defer_indexes:
+        with engine.begin() as connection:
+            for index in secondary_indexes():
+                index.drop(connection, checkfirst=True)
+            if search_index_exists(connection):
+                drop_search_triggers(connection)
+
+    for ids in _chunks(first_user, args.users, args.chunk_size):
+        with engine.begin() as connection:
+            bulk_insert(connection, User, USER_COLUMNS, user_rows(rng, ids, pool))
+        counts["users"] += len(ids)
+
+    user_ids = existing_users + list(range(first_user, first_user + args.users))
+    if not user_ids and args.events:
+        raise SystemExit("Events need at least one user; pass --users.")
+
+    for ids in _chunks(first_event, args.events, args.chunk_size):
+        events = event_rows(rng, ids, user_ids, args)
+        budgets = budget_rows(rng, events, budget_id, args)
+        budget_id += len(budgets)
+        tasks = task_rows(rng, events, user_ids, args)
+        resources = resource_rows(rng, events, args)
+        expenses = expense_rows(rng, events, budgets, args)
+        participants = participant_rows(rng, events, user_ids, args)
+        tables = (
+            ("events", Event, EVENT_COLUMNS, events),
+            ("tasks", Task, TASK_COLUMNS, tasks),
+            ("resources", EventResource, RESOURCE_COLUMNS, resources),
+            ("budgets", Budget, BUDGET_COLUMNS, budgets),
+            ("expenses", Expense, EXPENSE_COLUMNS, expenses),
+            ("participants", Participant, PARTICIPANT_COLUMNS, participants),
+        )
+        with engine.begin() as connection:
+            for key, model, columns, rows in tables:
+                bulk_insert(connection, model, columns, rows)
+                if key != "events":
+                    counts[key] += len(rows)
+            if not args.defer_indexes:
+                refresh_event_stats(connection, ids)
+        counts["events"] += len(ids)
+        echo(f"  {counts['events']}/{args.events} events", end="\r")
+
+    if args.defer_indexes:
+        echo("\nrebuilding indexes and event stats")
+        with engine.begin() as connection:
+            for index in secondary_indexes():
+                index.create(connection, checkfirst=True)
+            if search_index_exists(connection):
+                create_search_triggers(connection)
+                rebuild_search_index(connection)
+        # The per-event aggregates need the event_id indexes back
+        for ids in _chunks(first_event, args.events, args.chunk_size):
+            with engine.begin() as connection:
+                refresh_event_stats(connection, ids)
+
+    if engine.dialect.name == "postgresql":
+        # Explicit ids do not advance the serial sequences
+        with engine.begin() as connection:
+            for model in (User, Event, Budget):
+                table = model.__tablename__
+                connection.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                        f'(SELECT max(id) FROM "{table}"))'
+                    )
+                )
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    echo(
+        f"inserted {total} rows in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s): "
+        + ", ".join(f"{count} {name}" for name, count in counts.items())
+    )
+    return counts
+
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--create-tables", action="store_true")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
 
-def seed_all():
-    seed_users()
-    seed_events()
-    seed_tasks()
-    seed_resources()
-    seed_budgets()
-    seed_expenses()
-    seed_participants()
-    print("All data seeded successfully.")
+    url = args.database_url
+    if url is None:
+        url = database_uri() if "DATABASE_URL" in os.environ else None
+    engine = create_engine(url or "sqlite:///instance/app.db")
+    register_sqlite_pragmas(engine, DEFAULTS)
+    if args.create_tables:
+        db.metadata.create_all(engine)
+    generate(engine, args)
+    engine.dispose()
 
 
 if __name__ == "__main__":
-    seed_all()
+    main()
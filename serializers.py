@@ -0,0 +1,212 @@
+"""Precompiled per-model serializers for the API's read paths.
+
+``SerializerMixin.to_dict()`` and ``marshal_with`` both decide, for every
+row, which attributes to read and how to format them. A ``Serializer``
+makes those decisions once, at import time: it generates the source of a
+function that reads each attribute directly and formats it inline, and
+compiles it. Serializing a row is then a single dict literal.
+
+Field formats:
+
+    RAW       value as stored
+    STRING    str(value), as flask_restful's fields.String
+    ISO       datetime.isoformat()
+    DATETIME  "%Y-%m-%d %H:%M:%S", as SerializerMixin
+    TIME      "%H:%M", as SerializerMixin
+    RFC822    RFC 822 date, as flask_restful's fields.DateTime
+    DECIMAL   str(value)
+
+Every format maps None to None. With ``native=True`` ISO fields are left as
+datetime objects for encoders such as orjson that emit the same ISO string
+themselves.
+"""
+from calendar import timegm
+from email.utils import formatdate
+
+RAW = "raw"
+STRING = "string"
+ISO = "iso"
+DATETIME = "datetime"
+TIME = "time"
+RFC822 = "rfc822"
+DECIMAL = "decimal"
+
+_EXPRESSIONS = {
+    RAW: "{value}",
+    STRING: "_str({value})",
+    ISO: "{value}.isoformat()",
+    DATETIME: '{value}.strftime("%Y-%m-%d %H:%M:%S")',
+    TIME: '{value}.strftime("%H:%M")',
+    RFC822: "_formatdate(_timegm({value}.utctimetuple()))",
+    DECIMAL: "_str({value})",
+}
+
+_NAMESPACE = {"_str": str, "_formatdate": formatdate, "_timegm": timegm}
+
+
+class Serializer:
+    def __init__(self, fields, native=False):
+        """``fields`` maps output keys to a format, or to (attribute, format)."""
+        self.fields = fields
+        self.native = native
+        items = []
+        for key, spec in fields.items():
+            attribute, fmt = spec if isinstance(spec, tuple) else (key, spec)
+            if native and fmt == ISO:
+                fmt = RAW
+            value = f"obj.{attribute}"
+            if fmt == RAW:
+                expression = value
+            else:
+                converted = _EXPRESSIONS[fmt].format(value="_v")
+                expression = f"({converted} if (_v := {value}) is not None else None)"
+            items.append(f"{key!r}: {expression}")
+        body = "{" + ", ".join(items) + "}"
+        source = (
+            f"def serialize(obj):\n    return {body}\n"
+            f"def serialize_many(objs):\n    return [{body} for obj in objs]\n"
+        )
+        namespace = dict(_NAMESPACE)
+        exec(compile(source, f"<serializer {sorted(fields)}>", "exec"), namespace)
+        self.serialize = namespace["serialize"]
+        self.serialize_many = namespace["serialize_many"]
+
+    def __call__(self, obj):
+        return self.serialize(obj)
+
+    def many(self, objs):
+        return self.serialize_many(objs)
+
+
+# Payloads of the REST resources; their datetimes are formatted by the
+# API's JSON encoder
+
+event_serializer = Serializer(
+    {
+        "id": RAW,
+        "title": STRING,
+        "date": RFC822,
+        "time": STRING,
+        "location": STRING,
+        "description": STRING,
+        "category": STRING,
+    }
+)
+
+task_serializer = Serializer(
+    {
+        "id": RAW,
+        "title": RAW,
+        "description": RAW,
+        "deadline": ISO,
+        "priority": RAW,
+        "status": RAW,
+        "assigned_to": RAW,
+        "dependency": RAW,
+    },
+    native=True,
+)
+
+resource_serializer = Serializer(
+    {
+        "id": RAW,
+        "name": RAW,
+        "type": RAW,
+        "availability": RAW,
+        "reservation_date": ISO,
+        "reservation_end": ISO,
+    },
+    native=True,
+)
+
+expense_serializer = Serializer(
+    {"id": RAW, "name": RAW, "amount": DECIMAL, "date": ISO}, native=True
+)
+
+# Column dumps matching SerializerMixin.to_dict(); users leave out the
+# password hash
+
+user_serializer = Serializer(
+    {
+        "id": RAW,
+        "firstname": RAW,
+        "lastname": RAW,
+        "username": RAW,
+        "address": RAW,
+        "city": RAW,
+        "country": RAW,
+        "postal_code": RAW,
+        "aboutme": RAW,
+        "email": RAW,
+    }
+)
+
+event_row_serializer = Serializer(
+    {
+        "id": RAW,
+        "user_id": RAW,
+        "title": RAW,
+        "date": DATETIME,
+        "time": TIME,
+        "image": RAW,
+        "location": RAW,
+        "description": RAW,
+        "category": RAW,
+    }
+)
+
+task_row_serializer = Serializer(
+    {
+        "id": RAW,
+        "event_id": RAW,
+        "assigned_to": RAW,
+        "title": RAW,
+        "description": RAW,
+        "deadline": DATETIME,
+        "priority": RAW,
+        "status": RAW,
+        "dependency": RAW,
+    }
+)
+
+resource_row_serializer = Serializer(
+    {
+        "id": RAW,
+        "event_id": RAW,
+        "name": RAW,
+        "type": RAW,
+        "availability": RAW,
+        "reservation_date": DATETIME,
+        "reservation_end": DATETIME,
+    }
+)
+
+budget_row_serializer = Serializer(
+    {"id": RAW, "event_id": RAW, "allocated_budget": DECIMAL}
+)
+
+expense_row_serializer = Serializer(
+    {
+        "id": RAW,
+        "budget_id": RAW,
+        "event_id": RAW,
+        "name": RAW,
+        "amount": DECIMAL,
+        "date": DATETIME,
+    }
+)
+
+participant_row_serializer = Serializer(
+    {"id": RAW, "event_id": RAW, "user_id": RAW, "status": RAW, "role": RAW}
+)
+
+
+def serialize_event_details(event):
+    """Serialize an event together with its already-loaded child collections."""
+    data = event_row_serializer(event)
+    data["tasks"] = task_row_serializer.many(event.tasks)
+    data["resources"] = resource_row_serializer.many(event.resources)
+    data["budgets"] = budget_row_serializer.many(event.budgets)
+    data["expenses"] = expense_row_serializer.many(event.expenses)
+    data["participants"] = participant_row_serializer.many(event.participants)
+    return data
@@ -0,0 +1,220 @@
+"""Task dependency graph: cycle checks, scheduling and blocked counts.
+
+A TaskDependency row is an edge from a task to one of its prerequisites.
+``Task.blocked_by`` counts the prerequisites that are not Completed, so
+"ready" tasks (not Completed, blocked_by == 0) are a plain indexed query.
+Whenever a flush changes a task's status, deletes a task or adds or removes
+an edge, the counts of the tasks directly affected are recomputed in the
+same transaction; nothing else in the graph is touched. Writes that bypass
+the ORM unit of work must call ``refresh_dependents`` or
+``refresh_blocked_counts`` themselves.
+
+``schedule`` computes a topological order, the critical path of the work
+left and the ready tasks of an event in one O(V + E) pass.
+"""
+from collections import deque
+
+from sqlalchemy import event as sa_event, func, inspect, select, update
+
+from models import db, Task, TaskDependency
+
+COMPLETED = "Completed"
+
+
+def refresh_blocked_counts(connection, task_ids):
+    """Recompute ``blocked_by`` for ``task_ids`` from their edges."""
+    task_ids = {task_id for task_id in task_ids if task_id is not None}
+    if not task_ids:
+        return
+    task = Task.__table__
+    edge = TaskDependency.__table__
+    prerequisite = task.alias("prerequisite")
+    unmet = (
+        select(func.count())
+        .select_from(edge)
+        .join(prerequisite, prerequisite.c.id == edge.c.depends_on_id)
+        .where(
+            edge.c.task_id == task.c.id,
+            func.coalesce(prerequisite.c.status, "") != COMPLETED,
+        )
+        .scalar_subquery()
+    )
+    connection.execute(
+        update(task).where(task.c.id.in_(task_ids)).values(blocked_by=unmet)
+    )
+
+
+def dependent_ids(connection, task_ids):
+    """Ids of the tasks that depend directly on any of ``task_ids``."""
+    if not task_ids:
+        return set()
+    return set(
+        connection.execute(
+            select(TaskDependency.task_id).where(
+                TaskDependency.depends_on_id.in_(task_ids)
+            )
+        ).scalars()
+    )
+
+
+def refresh_dependents(connection, task_ids):
+    """Refresh the tasks waiting on ``task_ids`` after their status changed."""
+    refresh_blocked_counts(connection, dependent_ids(connection, task_ids))
+
+
+def delete_edges(connection, task_ids):
+    """Remove every edge touching ``task_ids`` and unblock their dependents."""
+    if not task_ids:
+        return
+    dependents = dependent_ids(connection, task_ids) - set(task_ids)
+    edge = TaskDependency.__table__
+    connection.execute(
+        edge.delete().where(
+            edge.c.task_id.in_(task_ids) | edge.c.depends_on_id.in_(task_ids)
+        )
+    )
+    refresh_blocked_counts(connection, dependents)
+
+
+def load_graph(connection, event_id):
+    """Return the (id, status) rows and the edges of an event's tasks."""
+    tasks = connection.execute(
+        select(Task.id, Task.status)
+        .where(Task.event_id == event_id)
+        .order_by(Task.id)
+    ).all()
+    edges = connection.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_id)
+        .where(TaskDependency.event_id == event_id)
+        .order_by(TaskDependency.task_id, TaskDependency.depends_on_id)
+    ).all()
+    return tasks, edges
+
+
+def find_cycle(edges, task_id, depends_on):
+    """Return the cycle that giving ``task_id`` the prerequisites
+    ``depends_on`` would close, as a list of task ids, or None.
+
+    ``edges`` are the event's current (task_id, depends_on_id) pairs; the
+    task's own edges are ignored since they are being replaced.
+    """
+    prerequisites = {}
+    for source, target in edges:
+        if source != task_id:
+            prerequisites.setdefault(source, []).append(target)
+
+    # Walk prerequisite edges from each new prerequisite; reaching task_id
+    # again means task_id would transitively depend on itself.
+    parent = {}
+    for start in depends_on:
+        if start == task_id:
+            return [task_id, task_id]
+        if start in parent:
+            continue
+        parent[start] = None
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for target in prerequisites.get(node, ()):
+                if target == task_id:
+                    path = [node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return [task_id, *reversed(path), task_id]
+                if target not in parent:
+                    parent[target] = node
+                    stack.append(target)
+    return None
+
+
+def schedule(tasks, edges):
+    """Topological order, critical path and ready tasks in one pass.
+
+    ``tasks`` are (id, status) pairs and ``edges`` (task_id, depends_on_id)
+    pairs. The critical path is the longest chain of tasks that are not
+    Completed yet, each counting as one unit of work. Tasks on a cycle
+    (only possible in data written around the API) are reported apart.
+    """
+    status = dict(tasks)
+    dependents = {task_id: [] for task_id in status}
+    waiting = dict.fromkeys(status, 0)
+    unmet = dict.fromkeys(status, 0)
+    for task_id, depends_on_id in edges:
+        if task_id not in status or depends_on_id not in status:
+            continue
+        dependents[depends_on_id].append(task_id)
+        waiting[task_id] += 1
+        if status[depends_on_id] != COMPLETED:
+            unmet[task_id] += 1
+
+    queue = deque(task_id for task_id in status if waiting[task_id] == 0)
+    order = []
+    # Remaining work on the longest chain ending at each task, and the
+    # previous task on that chain
+    length = {}
+    previous = {}
+    for task_id in queue:
+        length[task_id] = 0 if status[task_id] == COMPLETED else 1
+        previous[task_id] = None
+
+    while queue:
+        task_id = queue.popleft()
+        order.append(task_id)
+        for dependent in dependents[task_id]:
+            weight = 0 if status[dependent] == COMPLETED else 1
+            candidate = length[task_id] + weight
+            if candidate > length.get(dependent, -1):
+                length[dependent] = candidate
+                previous[dependent] = task_id
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                queue.append(dependent)
+
+    critical_path = []
+    if order:
+        node = max(order, key=lambda task_id: length[task_id])
+        while node is not None:
+            if status[node] != COMPLETED:
+                critical_path.append(node)
+            node = previous[node]
+        critical_path.reverse()
+
+    return {
+        "order": order,
+        "critical_path": critical_path,
+        "ready": [
+            task_id
+            for task_id in order
+            if status[task_id] != COMPLETED and unmet[task_id] == 0
+        ],
+        "cyclic": [task_id for task_id in status if waiting[task_id] > 0],
+    }
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def _refresh_blocked_after_flush(session, flush_context):
+    changed_prerequisites = set()
+    task_ids = set()
+    for instance in session.dirty:
+        if isinstance(instance, Task):
+            attrs = inspect(instance).attrs
+            if attrs.status.history.has_changes():
+                changed_prerequisites.add(instance.id)
+            # Edges dropped from a collection are deleted as orphans, which
+            # never appear in session.deleted
+            if attrs.prerequisite_links.history.has_changes():
+                task_ids.add(instance.id)
+            added, _, deleted = attrs.dependent_links.history
+            task_ids.update(link.task_id for link in (*added, *deleted))
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, TaskDependency):
+            task_ids.add(instance.task_id)
+    if not (changed_prerequisites or task_ids):
+        return
+    connection = session.connection()
+    task_ids.update(dependent_ids(connection, changed_prerequisites))
+    # Rows deleted in this flush have nothing left to update
+    task_ids.difference_update(
+        instance.id for instance in session.deleted if isinstance(instance, Task)
+    )
+    refresh_blocked_counts(connection, task_ids)
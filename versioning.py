@@ -0,0 +1,38 @@
+"""Event version tracking for conditional requests.
+
+``Event.version`` is incremented, and ``Event.updated_at`` refreshed,
+whenever an event row or any of its tasks, resources, budgets, expenses or
+participants is written, in the same transaction as the write. Writes that
+bypass the ORM unit of work must call ``bump_event_versions`` themselves.
+"""
+from sqlalchemy import event as sa_event, update
+
+from models import db, Event, utcnow
+from event_stats import changed_child_event_ids
+
+
+def bump_event_versions(connection, event_ids):
+    event_ids = {event_id for event_id in event_ids if event_id is not None}
+    if not event_ids:
+        return
+    connection.execute(
+        update(Event.__table__)
+        .where(Event.__table__.c.id.in_(event_ids))
+        .values(version=Event.__table__.c.version + 1, updated_at=utcnow())
+    )
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def _bump_versions_after_flush(session, flush_context):
+    event_ids = changed_child_event_ids(session)
+    event_ids.update(
+        instance.id
+        for instance in session.dirty
+        if isinstance(instance, Event) and session.is_modified(instance)
+    )
+    # Deleted events have no row left to bump
+    event_ids.difference_update(
+        instance.id for instance in session.deleted if isinstance(instance, Event)
+    )
+    if event_ids:
+        bump_event_versions(session.connection(), event_ids)